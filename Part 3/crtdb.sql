@@ -87,3 +87,10 @@ CREATE TABLE Attends (
     FOREIGN KEY (classId) REFERENCES Class(classId) -- Foreign key to the Class table
 );
 
+-- Indexes on the columns searched and joined on by the queries in file.py
+CREATE INDEX idx_class_instructor ON Class(instructorID);
+CREATE INDEX idx_attends_member ON Attends(memberID);
+CREATE INDEX idx_attends_class_member ON Attends(classID, memberID);
+CREATE INDEX idx_attends_date ON Attends(attendanceDate);
+CREATE INDEX idx_member_end ON Member(membershipEndDate);
+CREATE INDEX idx_class_type ON Class(classType COLLATE NOCASE);
@@ -8,11 +8,117 @@ Date: 03/23/2025
 Last Updated: 3/30/2025
 """
 
+import atexit
+import functools
+import queue
 import sqlite3
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 __dataBaseName__ =  "XYZGym.sqlite"
 
+_CONN = None # shared connection, opened on first use by _get_conn()
+
+# Indexes on the WHERE/JOIN columns used by the task queries, created on first connect if missing
+_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_class_instructor ON Class(instructorID)",
+    "CREATE INDEX IF NOT EXISTS idx_attends_member ON Attends(memberID)",
+    "CREATE INDEX IF NOT EXISTS idx_attends_class_member ON Attends(classID, memberID)", # same index as Part 4
+    "CREATE INDEX IF NOT EXISTS idx_attends_date ON Attends(attendanceDate)",
+    "CREATE INDEX IF NOT EXISTS idx_member_end ON Member(membershipEndDate)",
+    "CREATE INDEX IF NOT EXISTS idx_class_type ON Class(classType COLLATE NOCASE)",
+)
+
+# SQL queries for each task, defined once so every call reuses the same statement
+_SQL_MEMBERS_AND_MEMBERSHIP_PLAN = """
+    SELECT 
+        name, 
+        email, 
+        age, 
+        planId, 
+        cost, 
+        planType 
+    FROM Member, MembershipPlan 
+    NATURAL JOIN PAYMENT 
+    WHERE Member.memberID = Payment.memberID
+"""
+_SQL_NUMBER_OF_CLASS_FOR_EACH_GYM = """
+    SELECT 
+        g.location, 
+        COUNT(c.gymID) as 'Number of Classes' 
+    FROM class as c, 
+        GymFacility as g 
+    WHERE c.gymID = g.gymID 
+    GROUP BY g.gymID
+"""
+_SQL_MEMBERS_IN_CLASS = "SELECT name FROM Member NATURAL JOIN Attends WHERE Attends.classID = ?"
+_SQL_EQUIPMENT_BY_TYPE = "SELECT * FROM Equipment WHERE classType = ?"
+_SQL_EXPIRED_MEMBERSHIP_MEMBERS = "SELECT * FROM Member WHERE membershipEndDate <= DATE('now')"
+_SQL_CLASSES_BY_INSTRUCTOR = """
+    SELECT 
+        i.name AS instructor_name,
+        i.phone AS instructor_phone,
+        c.className AS class_name,
+        c.classType AS class_type,
+        c.duration,
+        c.classCapacity AS capacity
+    FROM Instructor i
+    JOIN Class c ON i.instructorID = c.instructorID
+    WHERE i.instructorID = ?
+"""
+_SQL_AVERAGE_AGE_BY_MEMBERSHIP_STATUS = """
+    SELECT
+        AVG(CASE WHEN membershipEndDate > DATE('now') THEN age END) AS active_avg,
+        AVG(CASE WHEN membershipEndDate <= DATE('now') THEN age END) AS expired_avg
+    FROM Member;
+"""
+# Ties on class_count are broken by instructorID (highest first, which keeps the original
+# report), so the result no longer depends on the order the chosen index returns rows in
+_SQL_TOP_INSTRUCTORS = """
+    SELECT
+        i.name AS instructor_name,
+        COUNT(c.classID) AS class_count
+    FROM Instructor i
+    JOIN Class c ON i.instructorID = c.instructorID
+    GROUP BY i.instructorID
+    ORDER BY class_count DESC, i.instructorID DESC
+    LIMIT 3;
+"""
+_SQL_MEMBERS_ATTENDED_CLASSES = """
+    SELECT m.memberID, m.name
+    FROM Member m
+    JOIN Attends a ON m.memberID = a.memberID
+    JOIN Class c ON a.classID = c.classID
+    WHERE c.classType = ? COLLATE NOCASE
+    GROUP BY m.memberID;
+"""
+_SQL_MEMBERS_ATTENDED_CLASSES_LIKE = """
+    SELECT m.memberID, m.name
+    FROM Member m
+    JOIN Attends a ON m.memberID = a.memberID
+    JOIN Class c ON a.classID = c.classID
+    WHERE c.classType LIKE ?
+    GROUP BY m.memberID;
+"""
+_SQL_LAST_MONTH_TOTALS = """
+    SELECT m.memberID,
+        m.name AS member_name,
+        COUNT(c.classID) AS total_classes
+    FROM Member m
+    JOIN Attends a ON m.memberID = a.memberID
+    JOIN Class c ON a.classID = c.classID
+    WHERE a.attendanceDate >= DATE('now', '-1 month')
+    GROUP BY m.memberID;
+"""
+_SQL_LAST_MONTH_CLASSES = """
+    SELECT a.memberID,
+        c.className,
+        c.classType
+    FROM Attends a
+    JOIN Class c ON a.classID = c.classID
+    WHERE a.attendanceDate >= DATE('now', '-1 month');
+"""
+
 def connectToDatabase() :
     """This method tries to connect to the XYZGym Database file. Terminates program on failure
 
@@ -20,13 +126,75 @@ def connectToDatabase() :
         Cursor: the cursor for database communication
     """
     try:
-        connection = sqlite3.connect(__dataBaseName__)
+        connection = sqlite3.connect(__dataBaseName__, isolation_level=None, check_same_thread=False,
+                                     cached_statements=256)
         print(f"Successfully connected to {__dataBaseName__}")
         return connection, connection.cursor() # return the cursor for further database interaction
     
     except Exception as e:
         print(f"ERROR: Database connection unsuccessful. Reason: {e}")
         sys.exit(1) # terminate program if connection fails
+
+def _get_conn():
+    """Returns the shared database connection, connecting on the first call only.
+
+    Every query helper reuses this one connection instead of opening a new one per query.
+    It is closed automatically when the interpreter exits. Switching to WAL and creating the
+    indexes are best-effort, so the read-only task queries still run on a read-only or locked file.
+
+    Returns:
+        Connection: the shared connection for database communication
+    """
+    global _CONN
+
+    if _CONN is None:
+        _CONN, _ = connectToDatabase()
+        try:
+            _CONN.execute("PRAGMA journal_mode=WAL")
+        except sqlite3.OperationalError as e:
+            print(f"Note: could not switch the database to WAL mode ({e})")
+        _CONN.execute("PRAGMA synchronous=NORMAL")
+        _CONN.execute("PRAGMA temp_store=MEMORY")
+        _CONN.execute("PRAGMA cache_size=-64000")
+        _create_indexes(_CONN)
+
+    return _CONN
+
+def _create_indexes(connection):
+    """Creates any missing indexes used by the task queries. When an index was added,
+    ANALYZE is run once so the query planner has statistics for it. If the database cannot
+    be written to, a note is printed and the task queries run without the new indexes.
+
+    Args:
+        connection (Connection): the database connection
+    """
+    countQuery = "SELECT COUNT(*) FROM sqlite_master WHERE type = 'index'"
+    indexCount = connection.execute(countQuery).fetchone()[0]
+
+    try:
+        for statement in _INDEXES:
+            connection.execute(statement)
+
+        if connection.execute(countQuery).fetchone()[0] != indexCount:
+            connection.execute("ANALYZE")
+    except sqlite3.OperationalError as e:
+        # e.g. a read-only or locked database file; the queries still work without the indexes
+        print(f"Note: could not create the query indexes ({e})")
+
+@functools.lru_cache(maxsize=None)
+def _prepare(query):
+    """Returns the cursor reserved for a query on the shared connection, creating it on first use.
+    Together with the connection's statement cache this means each query is compiled only once.
+
+    Args:
+        query (String): the SQL query the cursor will execute
+
+    Returns:
+        Cursor: the cursor for this query
+    """
+    return _get_conn().cursor()
+
+atexit.register(lambda: _CONN and _CONN.close()) # close the shared connection on exit
         
 def checkForInteger(inputToCheck):
     """Function to check if a String represents a a postivie integer
@@ -60,96 +228,99 @@ def checkForString(inputToCheck):
     else:
         return str(inputToCheck)
 
-def execute_query(query, params=()):
+def execute_query(query, params=(), background=False):
     """
     Executes an SQL query and prints the results
 
     Parameters:
-    - db_name: The database name
     - query: The SQL query to execute
     - params: Parameters to be passed to the query (default is empty tuple)
+    - background: Run the query on a worker thread and print rows as they arrive (default is False)
     """
 
-    # Establish a database connection and cursor
-    connection, cursor = connectToDatabase()
-
     try:
-        cursor.execute(query, params) # Execute the query with parameters
-        results = cursor.fetchall() # Fetch all the results of the query
-
-        # If there are result, print them
-        if results:
-            for row in results:
+        if background:
+            batches = _fetch_in_background(query, params) # Batches arrive from a worker thread
+        else:
+            cursor = _prepare(query).execute(query, params) # Execute the query on its shared cursor
+            cursor.arraysize = 256 # Number of rows fetched per batch
+            batches = iter(cursor.fetchmany, [])
+
+        # Print the results batch by batch instead of fetching them all at once
+        foundResults = False
+        for rows in batches:
+            foundResults = True
+            for row in rows:
                 print(row)
+
         # If there are no results, a message is printed
-        else:
+        if not foundResults:
             print("No results found.")
     except sqlite3.Error as e:
         print(f"Database error: {e}")
-    finally:
-        connection.close() # Close the database connection after the query is executed
+
+def _fetch_in_background(query, params=(), batchSize=100):
+    """Runs a query on a worker thread and yields its rows in batches as soon as each batch is fetched,
+    so long-running reports start printing before the whole query has finished.
+
+    Args:
+        query (String): the SQL query to execute
+        params (tuple): parameters to be passed to the query
+        batchSize (int): number of rows fetched per batch
+
+    Yields:
+        list: the next batch of rows
+    """
+    batches = queue.Queue()
+
+    def worker():
+        try:
+            cursor = _prepare(query).execute(query, params)
+            while rows := cursor.fetchmany(batchSize):
+                batches.put(rows)
+        finally:
+            batches.put(None) # tells the main thread that no more rows will follow
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(worker)
+        while (rows := batches.get()) is not None:
+            yield rows
+        future.result() # re-raises any database error from the worker
 
 def get_members_and_membership_plan():
     """
     Fetches all members name, email, and age as well as their membership plan
     """
-    query = """
-        SELECT 
-            name, 
-            email, 
-            age, 
-            planId, 
-            cost, 
-            planType 
-        FROM Member, MembershipPlan 
-        NATURAL JOIN PAYMENT 
-        WHERE Member.memberID = Payment.memberID
-    """
 
-    execute_query(query)
+    execute_query(_SQL_MEMBERS_AND_MEMBERSHIP_PLAN)
 
 def get_number_of_class_for_each_gym():
     """
     Fetches the number of classes that each gym facility offers
     """
 
-    query = """SELECT 
-    g.location, 
-    COUNT(c.gymID) as 'Number of Classes' 
-    FROM class as c, 
-    GymFacility as g 
-    WHERE c.gymID = g.gymID 
-    GROUP BY g.gymID
-    """
-
-    execute_query(query)
+    execute_query(_SQL_NUMBER_OF_CLASS_FOR_EACH_GYM)
 
 def get_members_in_class(classID):
     """
     Fetches all the members that attend a specific class
     """
 
-    query = "SELECT name FROM Member NATURAL JOIN Attends WHERE Attends.classID = ?"
-
-    execute_query(query, (classID,))
+    execute_query(_SQL_MEMBERS_IN_CLASS, (classID,))
 
 def get_equipment_by_type(equipmentType):
     """
     Fethces specific equipment by type
     """
 
-    query = "SELECT * FROM Equipment WHERE classType = ?"
-
-    execute_query(query, (equipmentType,))
+    execute_query(_SQL_EQUIPMENT_BY_TYPE, (equipmentType,))
 
 def get_expired_membership_members():
     """
     Fetches the members with expired memberships
     """
 
-    query ="SELECT * FROM Member WHERE membershipEndDate <= DATE('now')"
-
-    execute_query(query)
+    execute_query(_SQL_EXPIRED_MEMBERSHIP_MEMBERS)
 
 
 def get_classes_by_instructor(instructor_id):
@@ -157,129 +328,131 @@ def get_classes_by_instructor(instructor_id):
     Fetches the list of classes taught by a specific instructor with details.
     """
 
-    query = """
-        SELECT 
-            i.name AS instructor_name,
-            i.phone AS instructor_phone,
-            c.className AS class_name,
-            c.classType AS class_type,
-            c.duration,
-            c.classCapacity AS capacity
-        FROM Instructor i
-        JOIN Class c ON i.instructorID = c.instructorID
-        WHERE i.instructorID = ?
-    """
-    execute_query(query, (instructor_id,))  
+    execute_query(_SQL_CLASSES_BY_INSTRUCTOR, (instructor_id,))  
 
-def get_average_age_active_memerbship():
+def get_average_age_by_membership_status():
     """
-    Fetches the average age of members with active memberships.
+    Fetches the average age of members with active and with expired memberships in a single pass over Member.
     """
 
-    query = """
-        SELECT AVG(age) AS average_age
-        FROM Member
-        WHERE membershipEndDate > DATE('now');
-    """
-    execute_query(query)
+    try:
+        cursor = _prepare(_SQL_AVERAGE_AGE_BY_MEMBERSHIP_STATUS)
+        active_avg, expired_avg = cursor.execute(_SQL_AVERAGE_AGE_BY_MEMBERSHIP_STATUS).fetchone()
 
-def get_average_age_expired_memerbship():
-    """
-    Fetches the average age of members with expired memberships.
-    """
+        print(f"Average age for active memberships: {active_avg}")
+        print(f"Average age for expired memberships: {expired_avg}")
 
-    query = """
-        SELECT AVG(age) AS average_age
-        FROM Member
-        WHERE membershipEndDate <= DATE('now');
-    """
-    execute_query(query)
+    # Print error if database query fails
+    except sqlite3.Error as e:
+        print(f"Error executing query: {e}")
 
 def get_top_instructors():
     """
     Fetches the top 3 instructor with the most taught classes.
     """
     
-    query = """
-        SELECT
-            i.name AS instructor_name,
-            COUNT(c.classID) AS class_count
-        FROM Instructor i
-        JOIN Class c ON i.instructorID = c.instructorID
-        GROUP BY i.instructorID
-        ORDER BY class_count DESC
-        LIMIT 3;
-    """
-    execute_query(query)
+    execute_query(_SQL_TOP_INSTRUCTORS, background=True)
 
-def get_members_attended_classes(class_type):
+def get_members_attended_classes(class_type, exact=True):
     """
     Fetches the members who attended classes of a specific type.
-    """
 
-    query =  """
-        SELECT m.memberID, m.name
-        FROM Member m
-        JOIN Attends a ON m.memberID = a.memberID
-        JOIN Class c ON a.classID = c.classID
-        WHERE c.classType LIKE ?
-        GROUP BY m.memberID;
+    Args:
+        class_type (String): the class type, or a LIKE pattern when exact is False
+        exact (bool): match the class type exactly (case-insensitive) using the class type index
     """
+
+    query = _SQL_MEMBERS_ATTENDED_CLASSES if exact else _SQL_MEMBERS_ATTENDED_CLASSES_LIKE
     execute_query(query, (class_type,))  
 
 def members_attended_classes_last_month():
     """
     Fetches members who attended classes last month and their details.
-    """
 
-    query = """
-        SELECT m.name AS member_name,
-            COUNT(c.classID) AS total_classes,
-            GROUP_CONCAT(c.className, ', ') AS class_names,
-            GROUP_CONCAT(c.classType, ', ') AS class_types
-        FROM Member m
-        JOIN Attends a ON m.memberID = a.memberID
-        JOIN Class c on a.classID = c.classID
-        WHERE a.attendanceDate >= DATE('now', '-1 month')
-        GROUP BY m.memberID;
+    The attended classes and the per-member totals are fetched by two separate queries on a
+    worker thread; the classes are grouped by member in Python rather than concatenated by SQLite.
     """
-    
-    # Execute query, process results, and print attendance details
-    connection, cursor = connectToDatabase()
+
+    # Execute queries, process results, and print attendance details
     try:
-        cursor.execute(query)
-        results = cursor.fetchall() # Fetch the query results
+        # Query 1: one row per attended class, grouped by member as the batches arrive
+        classNames = {}
+        classTypes = {}
+        for rows in _fetch_in_background(_SQL_LAST_MONTH_CLASSES):
+            for member_id, class_name, class_type in rows:
+                classNames.setdefault(member_id, []).append(class_name)
+                classTypes.setdefault(member_id, []).append(class_type)
 
         print("Recent Class Attendance:")
         print(f"{'Member Name':<25}{'Total Classes Attended':<40}{'Classes Attended':<30}{'Class Types':<20}")
         print("=" * 120)
 
-        # Print results for each member
-        for row in results:
-            member_name = row[0]
-            total_classes = row[1]
-            class_name = row[2]
-            class_type = row[3]
+        # Query 2: one row per member with the number of classes attended, printed as the batches arrive
+        for rows in _fetch_in_background(_SQL_LAST_MONTH_TOTALS):
+            for member_id, member_name, total_classes in rows:
+                class_name = ", ".join(classNames.get(member_id, []))
+                class_type = ", ".join(classTypes.get(member_id, []))
 
-            print(f"{member_name:<25}{total_classes:<40}{class_name:<30}{class_type:<20}")
+                print(f"{member_name:<25}{total_classes:<40}{class_name:<30}{class_type:<20}")
 
     # Print error if database query fails
     except sqlite3.Error as e:
         print(f"Error executing query: {e}")
-
-    # Close connection after query execution
-    finally:
-        connection.close()
         
+def _requireArgument(task, errorMessage):
+    """Wraps a task that needs the second command line argument, printing an error when it is missing
+
+    Args:
+        task (function): the task, called with the second argument
+        errorMessage (String): the message printed when no second argument was passed
+
+    Returns:
+        function: the task entry for the _TASKS table
+    """
+    def run(secondArg):
+        if secondArg:
+            task(secondArg)
+        else:
+            print(errorMessage)
+    return run
+
+def _averageAgeTask(_):
+    """Task 7: calculates the average ages for active and expired memberships"""
+    print("Calculating average age for active and expired memberships...")
+    get_average_age_by_membership_status()
+
+def _attendedClassesTask(class_type):
+    """Task 9: displays the members who attended classes of the given type"""
+    # only fall back to a LIKE scan when the argument contains wildcards
+    exact = "%" not in class_type and "_" not in class_type
+    get_members_attended_classes(class_type, exact)
+
+def _invalidTask(_):
+    """Handles an invalid task number"""
+    print("ERROR: The integer passed must be one from 1 to 10.")
+    sys.exit(1)
+
+# Task number -> function called with the second command line argument (or None)
+_TASKS = {
+    1: lambda _: get_members_and_membership_plan(),
+    2: lambda _: get_number_of_class_for_each_gym(),
+    3: _requireArgument(lambda a: get_members_in_class(checkForInteger(a)), "ERROR: Please provide a class ID"),
+    4: _requireArgument(lambda a: get_equipment_by_type(checkForString(a)), "ERROR: Please provide an equipment type"),
+    5: lambda _: get_expired_membership_members(),
+    6: _requireArgument(lambda a: get_classes_by_instructor(checkForInteger(a)), "ERROR: Please provide an instructor ID."),
+    7: _averageAgeTask,
+    8: lambda _: get_top_instructors(),
+    9: _requireArgument(_attendedClassesTask, "ERROR: Please provide an class type."),
+    10: lambda _: members_attended_classes_last_month(),
+}
+
 def main():
     """The main function. Calls database connection function and fetches command line arguments.
-        Then checks the first passed parameter for validity (positive integer or not) and passes
-        it to a switch statement for further processing
+        Then checks the first passed parameter for validity (positive integer or not) and looks
+        up the matching task in the _TASKS table for further processing
     """
-    connection = None
-    
     try:
-        connection, cursor = connectToDatabase()
+        _get_conn() # connect once; every task reuses this connection
         
         cmdLineArgs = sys.argv
         
@@ -293,86 +466,11 @@ def main():
         if len(cmdLineArgs) > 2: # check if second arg was passed
             secondArg = cmdLineArgs[2]
         
-        match taskNumber:
-            case 1:
-                
-                # call function for task 1
-                get_members_and_membership_plan()
-            
-            case 2:
-
-                # call function for task 2
-                get_number_of_class_for_each_gym()
-                
-            case 3:
-
-                # call function for task 3
-                if secondArg:
-                    classID = checkForInteger(secondArg)
-                    get_members_in_class(classID)
-                else:
-                    print("ERROR: Please provide a class ID")
-
-            case 4:
-
-                # call function for task 4
-                if secondArg:
-                    equipmentType = checkForString(secondArg)
-                    get_equipment_by_type(equipmentType)
-                else:
-                    print("ERROR: Please provide an equipment type")
-                
-            case 5:
-
-                # call function for task 5
-                get_expired_membership_members()
-                
-            case 6:
-
-                # For task 6, get instructor ID from second argument and fetch their classes
-                if secondArg:
-                    instructor_id = checkForInteger(secondArg)
-                    get_classes_by_instructor(instructor_id)
-                else:
-                    print("ERROR: Please provide an instructor ID.")
-
-            case 7:
-
-                # Calling function to caluclate active membership average age
-                print("Calculating average age for active memerbships...")
-                get_average_age_active_memerbship()
-
-                # Calling function to calculate expired membership average age
-                print("Calculating average age for expired memerbships...")
-                get_average_age_expired_memerbship()
-
-            case 8:
-                # For task 8, get and display the top 3 instructors
-                get_top_instructors() 
-
-            case 9:
-
-                # For task 9, get class type from second argument and display members who attended
-                if secondArg:
-                    class_type = secondArg
-                    get_members_attended_classes(class_type)
-                else:
-                    print("ERROR: Please provide an class type.")
-                    
-            case 10:
-
-                # Display members who attended classes last month
-                members_attended_classes_last_month()
-
-            case default:
-
-                # Handle invalid task number
-                print("ERROR: The integer passed must be one from 1 to 10.")
-                sys.exit(1)
+        # Run the requested task, or report an invalid task number
+        _TASKS.get(taskNumber, _invalidTask)(secondArg)
     
-    finally:
-        if connection:
-            connection.close()
+    except sqlite3.Error as e:
+        print(f"Database error: {e}")
         
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -74,7 +74,7 @@ CREATE TABLE Payment (
     planId INTEGER,
     amountPaid REAL NOT NULL,
     paymentDate DATE NOT NULL,
-    FOREIGN KEY (memberId) REFERENCES Member(memberId), -- Foreign key to the Member table
+    FOREIGN KEY (memberId) REFERENCES Member(memberId) ON DELETE CASCADE, -- Foreign key to the Member table
     FOREIGN KEY (planId) REFERENCES MembershipPlan(planId) -- Foreign key to the MembershipPlan table
 );
 
@@ -83,7 +83,15 @@ CREATE TABLE Attends (
     memberId INTEGER,
     classId INTEGER,
     attendanceDate DATE NOT NULL,
-    FOREIGN KEY (memberId) REFERENCES Member(memberId), -- Foreign key to the Member table
-    FOREIGN KEY (classId) REFERENCES Class(classId) -- Foreign key to the Class table
+    FOREIGN KEY (memberId) REFERENCES Member(memberId) ON DELETE CASCADE, -- Foreign key to the Member table
+    FOREIGN KEY (classId) REFERENCES Class(classId) ON DELETE CASCADE -- Foreign key to the Class table
 );
 
+-- Index on Attends(classID, memberID): speeds up counting and listing the members of a class
+CREATE INDEX idx_attends_class_member ON Attends(classID, memberID);
+
+-- Index on Attends.memberID: speeds up removing a member's attendance records
+CREATE INDEX idx_attends_member ON Attends(memberID);
+
+-- Index on Equipment.gymID: speeds up looking up the equipment of a gym
+CREATE INDEX idx_equipment_gym ON Equipment(gymID);
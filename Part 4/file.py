@@ -12,24 +12,179 @@ Last Updated: 4/28/2025
 """
 
 import PySimpleGUI as sg      
-import sqlite3
+import atexit
 import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 
 __dataBaseName__ =  "XYZGym.sqlite"
 
+_CONN = None # connection opened by connectToDatabase(), reused on later calls
+_WRITER = None # single background thread that runs database writes and reads, started by _open_connection()
+_CURSORS = {} # reusable cursors, keyed by (connection, SQL text) or (connection, None) for the shared one
+_ID_SETS = {} # frozensets of reference-table IDs loaded by _id_set(), keyed by table name
+_ATTENDANCE = {} # (time loaded, rows) cached by get_classes_with_attendance(), keyed by connection
+_ATTENDANCE_TTL = 30 # seconds a cached attendance result is reused
+
+# Primary key column of each table whose IDs _id_set() may load
+_ID_COLUMNS = {
+    "Member": "memberID",
+    "Class": "classID",
+    "MembershipPlan": "planId",
+    "Instructor": "instructorID",
+    "GymFacility": "gymID",
+    "Equipment": "equipmentID",
+}
+
+# Indexes used by the lookup and join queries below, created on connect if missing
+_INDEXES = (
+    # (classID, memberID) covers the Attends side of the class lookups and joins
+    # (Part 3 creates the same index, so both programs keep one definition)
+    "CREATE INDEX IF NOT EXISTS idx_attends_class_member ON Attends(classID, memberID)",
+    # memberID alone serves deleting a member's attendance and the foreign key check on Member deletes
+    "CREATE INDEX IF NOT EXISTS idx_attends_member ON Attends(memberID)",
+    "CREATE INDEX IF NOT EXISTS idx_equipment_gym ON Equipment(gymID)",
+)
+_SQL_INDEX_NAMES = "SELECT name FROM sqlite_master WHERE type = 'index'"
+
+# SQL queries used by the functions below
+_SQL_ADD_MEMBER = """
+    INSERT INTO Member (name, email, phone, address, age, membershipStartDate, membershipEndDate)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+_SQL_ADD_MEMBER_RETURNING_ID = """
+    INSERT INTO Member (name, email, phone, address, age, membershipStartDate, membershipEndDate)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    RETURNING memberID
+"""
+_SQL_ADD_PAYMENT = """
+    INSERT INTO Payment (memberID, planID, amountPaid, paymentDate)
+    VALUES (?, ?, ?, ?)
+"""
+_SQL_UPDATE_MEMBER = """
+    UPDATE Member
+    SET name = ?, email = ?, phone = ?, address = ?, age = ?,
+        membershipStartDate = ?, membershipEndDate = ?
+    WHERE memberID = ?
+"""
+_SQL_MEMBER_EXISTS = "SELECT EXISTS(SELECT 1 FROM Member WHERE memberID = ? LIMIT 1)"
+_SQL_DELETE_MEMBER_ATTENDS = "DELETE FROM Attends WHERE memberID = ?"
+_SQL_DELETE_MEMBER_PAYMENTS = "DELETE FROM Payment WHERE memberID = ?"
+_SQL_DELETE_MEMBER = "DELETE FROM Member WHERE memberID = ?"
+_SQL_ADD_CLASS = """
+    INSERT INTO Class (className, classType, duration, classCapacity, instructorID, gymID)
+    VALUES (?, ?, ?, ?, ?, ?)
+    RETURNING classID
+"""
+_SQL_UPDATE_CLASS = """
+    UPDATE Class
+    SET className = ?, classType = ?, duration = ?, classCapacity = ?,
+        instructorID = ?, gymID = ?
+    WHERE classID = ?
+"""
+_SQL_DELETE_CLASS_ATTENDS = "DELETE FROM Attends WHERE classID = ?"
+_SQL_DELETE_CLASS = "DELETE FROM Class WHERE classID = ?"
+_SQL_GET_ALL_CLASSES = """
+    SELECT classID, className, classType, duration, classCapacity, instructorID, gymID
+    FROM Class
+"""
+_SQL_GET_CLASSES_WITH_ATTENDANCE = """
+    SELECT
+        c.classID,
+        c.className,
+        c.classType,
+        c.duration,
+        c.classCapacity,
+        (SELECT COUNT(*) FROM Attends a WHERE a.classID = c.classID) AS num_attendees
+    FROM Class c
+"""
+_SQL_CLASS_HAS_MEMBERS = "SELECT COUNT(*) FROM Attends WHERE classID = ?"
+_SQL_MOVE_MEMBERS = "UPDATE Attends SET classID = ? WHERE classID = ?"
+_SQL_CHECK_EMAIL_EXISTS = "SELECT EXISTS(SELECT 1 FROM Member WHERE email = ? LIMIT 1)"
+_SQL_CLASS_EXISTS = "SELECT EXISTS(SELECT 1 FROM Class WHERE classID = ? LIMIT 1)"
+_SQL_GET_MEMBERS_AND_MEMBERSHIP_PLAN = """
+    SELECT
+        m.memberID,
+        m.name,
+        m.email,
+        m.age,
+        mp.planId
+    FROM Member m
+    JOIN Payment p ON m.memberID = p.memberID
+    JOIN MembershipPlan mp ON p.planId = mp.planId
+"""
+_SQL_MEMBERSHIP_PLAN_EXISTS = "SELECT EXISTS(SELECT 1 FROM MembershipPlan WHERE planId = ? LIMIT 1)"
+_SQL_GET_ALL_MEMBERSHIP_PLAN_IDS = "SELECT planID FROM MembershipPlan"
+_SQL_GET_MEMBERS_IN_CLASS = """
+    SELECT
+        m.memberID,
+        m.name,
+        m.email,
+        m.age
+    FROM Member m
+    INNER JOIN Attends a ON m.memberID = a.memberID
+    WHERE a.classID = ?
+"""
+_SQL_INSTRUCTOR_EXISTS = "SELECT EXISTS(SELECT 1 FROM Instructor WHERE instructorID = ? LIMIT 1)"
+_SQL_GYM_EXISTS = "SELECT EXISTS(SELECT 1 FROM GymFacility WHERE gymID = ? LIMIT 1)"
+_SQL_GET_ALL_EQUIPMENT = "SELECT * FROM Equipment"
+_SQL_ADD_EQUIPMENT = "INSERT INTO Equipment (name, classType, quantity, gymID) VALUES (?, ?, ?, ?)"
+_SQL_LAST_INSERT_ID = "SELECT last_insert_rowid()"
+_SQL_UPDATE_EQUIPMENT = """
+    UPDATE Equipment
+    SET name = ?, classType = ?, quantity = ?, gymID = ?
+    WHERE equipmentID = ?
+"""
+_SQL_UPSERT_EQUIPMENT = """
+    INSERT INTO Equipment (equipmentID, name, classType, quantity, gymID)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT(equipmentID) DO UPDATE SET
+        name = excluded.name, classType = excluded.classType,
+        quantity = excluded.quantity, gymID = excluded.gymID
+    RETURNING equipmentID
+"""
+_SQL_DELETE_EQUIPMENT = "DELETE FROM Equipment WHERE equipmentID = ?"
+_SQL_EQUIPMENT_EXISTS = "SELECT EXISTS(SELECT 1 FROM Equipment WHERE equipmentID = ? LIMIT 1)"
+
+# Values are always passed through ? placeholders and never formatted into the SQL text, so each
+# query's text is identical on every call and stays a hit in the connection's statement cache
+# (cached_statements=256 in _open_connection).
+
 def connectToDatabase():
     """
-    Prompts the user to input the database name and connects to it if valid.
-    
-    Validates the user input to ensure:
+    Connects to the XYZGym database, prompting the user for the database name only if needed.
+
+    If the expected database file can be opened from the current directory it is used directly.
+    Otherwise the user is prompted for the database name, and the input is validated to ensure:
     - A database name is entered
     - The entered name matches the expected datbase
     - The database file exists in the directory
 
+    The connection is opened once and returned again on every later call.
+
     Returns:
         Connection object if successful, None if user cancels.
     """
 
+    global _CONN
+
+    # Reuse the connection if one was already opened
+    if _CONN is not None:
+        return _CONN
+
+    # Skip the prompt when the expected database file is already present
+    try:
+        _CONN = _open_connection(__dataBaseName__)
+        return _CONN
+    except FileNotFoundError:
+        # The database file does not exist (yet), fall back to the prompt
+        pass
+    except sqlite3.Error as e:
+        # Catch any other SQLite connection errors and fall back to the prompt
+        sg.popup_error(f'Error: {e}')
+
     while True:
         # Ask user for the database name
         db_name = sg.popup_get_text('Enter database name (e.g., XYZGym.sqlite):')
@@ -49,22 +204,262 @@ def connectToDatabase():
             sg.popup_error(f"The database '{db_name}' is not valid. Please try again.")
             continue
     
-        # Check if the database file exists in the current directory
-        if not os.path.exists(db_name):
-            sg.popup_error(f"The database '{db_name}' does not exist. Please check the database file.")
-            continue
-    
         try:
-            # Attempt to connect to the database
-            connection = sqlite3.connect(db_name)
+            # Attempt to connect to the database (fails if the file does not exist)
+            _CONN = _open_connection(db_name)
             sg.popup('Connection successful!')
-            return connection
+            return _CONN
+        except FileNotFoundError:
+            # Opening in read-write mode fails when the database file is missing
+            sg.popup_error(f"The database '{db_name}' does not exist. Please check the database file.")
+            continue
         except sqlite3.Error as e:
             # Catch any SQLite connection errors
             sg.popup_error(f'Error: {e}')
             continue
 
-def execute_query(query, connection, params=()):
+def _open_connection(db_name):
+    """
+    Opens a new connection to the given database file and prepares it for use.
+
+    The GUI is meant to open exactly one connection (through connectToDatabase) and pass it
+    to every handler, so the connection's page cache stays warm for the whole session.
+
+    Parameters:
+    - db_name (str): The database file to open.
+
+    Returns:
+    - sqlite3.Connection: The new connection.
+
+    Raises:
+    - FileNotFoundError: If the database file does not exist.
+    - sqlite3.Error: If an existing file cannot be opened, or preparing the opened connection
+      fails (the connection is closed again).
+    """
+
+    global _WRITER
+
+    # Warn if a second connection is opened while the shared one is still in use
+    if _CONN is not None:
+        print("Warning: opening an additional database connection; reuse the one from connectToDatabase() instead.")
+
+    # mode=rw makes SQLite fail instead of creating the file if it does not exist;
+    # isolation_level=None leaves transactions to _transaction instead of opening one before every write:
+    # reads run outside any transaction and single-statement writes commit on their own
+    try:
+        connection = sqlite3.connect(f"file:{db_name}?mode=rw", uri=True, isolation_level=None,
+                                     cached_statements=256, check_same_thread=False)
+    except sqlite3.OperationalError as e:
+        # Only a missing file is reported as missing; other failures (a directory, no permission) are re-raised
+        if os.path.exists(db_name):
+            raise
+        raise FileNotFoundError(f"The database '{db_name}' does not exist: {e}") from e
+
+    # Errors from here on are real database errors (e.g. "database is locked"), not a missing file
+    try:
+        configure_connection(connection)
+        connection.row_factory = sqlite3.Row # rows can be read by column name as well as by index
+
+        # Set XYZGYM_TRACE_SQL=1 to print every statement as it runs, e.g. to check that a query's
+        # text is the same on every call (and is therefore reused from the statement cache)
+        if os.environ.get("XYZGYM_TRACE_SQL"):
+            connection.set_trace_callback(print)
+        create_indexes(connection)
+    except sqlite3.Error:
+        connection.close()
+        raise
+
+    # Start the background database thread (again, if close_connection stopped it)
+    if _WRITER is None:
+        _WRITER = ThreadPoolExecutor(max_workers=1)
+    atexit.register(optimize_database, connection) # refresh planner statistics even on an unexpected exit
+    return connection
+
+def configure_connection(connection):
+    """
+    Applies the per-connection PRAGMA settings used by the GUI.
+
+    Parameters:
+    - connection (sqlite3.Connection): The connection to configure.
+    """
+
+    # WAL journal with NORMAL sync: one fsync per commit instead of two;
+    # temporary tables and a 64 MB page cache stay in memory;
+    # memory-mapped reads avoid a read() syscall per page on table scans;
+    # foreign keys are enforced so writes cannot leave dangling references
+    connection.executescript("""
+        PRAGMA journal_mode=WAL;
+        PRAGMA synchronous=NORMAL;
+        PRAGMA temp_store=MEMORY;
+        PRAGMA cache_size=-64000;
+        PRAGMA wal_autocheckpoint=1000;
+        PRAGMA mmap_size=268435456;
+        PRAGMA foreign_keys=ON;
+    """)
+
+def optimize_database(connection):
+    """
+    Runs `PRAGMA optimize` so SQLite refreshes the planner statistics of tables whose data
+    changed during this session, giving the next session better query plans.
+
+    Parameters:
+    - connection (sqlite3.Connection): The active connection to the database.
+    """
+
+    try:
+        connection.execute("PRAGMA optimize")
+    except sqlite3.ProgrammingError:
+        # The connection was already closed (and optimized) by close_connection
+        pass
+    except sqlite3.Error as e:
+        # Print an error message if the optimization fails
+        print(f"Error optimizing database: {e}")
+
+def close_connection(connection):
+    """
+    Finishes pending writes, refreshes the planner statistics and closes the connection.
+
+    Parameters:
+    - connection (sqlite3.Connection): The active connection to the database.
+    """
+
+    global _CONN
+
+    shutdown_writer() # let pending writes finish before closing
+    optimize_database(connection)
+
+    # Drop the cached cursors and results that belong to this connection
+    for key in [key for key in _CURSORS if key[0] is connection]:
+        del _CURSORS[key]
+    _ATTENDANCE.pop(connection, None)
+
+    connection.close()
+
+    # Forget the shared connection so a later connectToDatabase() opens a new one
+    if connection is _CONN:
+        _CONN = None
+
+@contextmanager
+def _transaction(connection):
+    """
+    Runs the statements of a `with` block as one transaction: committed if the block
+    finishes, rolled back if it raises an error.
+
+    Parameters:
+    - connection (sqlite3.Connection): The active connection to the database.
+    """
+
+    connection.execute("BEGIN")
+    try:
+        yield
+    except BaseException:
+        connection.execute("ROLLBACK")
+        raise
+    connection.execute("COMMIT")
+
+def create_indexes(connection):
+    """
+    Creates the indexes the queries in this file rely on, if they do not exist yet.
+
+    When the set of indexes changed, ANALYZE is run once so the query planner has
+    statistics for the new indexes.
+
+    Parameters:
+    - connection (sqlite3.Connection): The active connection to the database.
+    """
+
+    with _transaction(connection): # Creates all indexes in one transaction
+        indexes_before = connection.execute(_SQL_INDEX_NAMES).fetchall()
+        for statement in _INDEXES:
+            connection.execute(statement)
+        if connection.execute(_SQL_INDEX_NAMES).fetchall() != indexes_before:
+            connection.execute("ANALYZE")
+
+def submit_write(function, *args):
+    """
+    Runs a database write function on the background writer thread.
+
+    Writes are executed one at a time, in the order they were submitted, so the GUI thread
+    does not block while SQLite commits the changes to disk.
+
+    Parameters:
+    - function (callable): The write function to run (e.g. add_member).
+    - *args: Arguments passed to the function.
+
+    Returns:
+    - concurrent.futures.Future: Handle holding the function's return value once it finishes.
+    """
+
+    return _WRITER.submit(function, *args)
+
+# Reads share the writer thread, so they see every write submitted before them and the
+# connection is never used by two threads at once
+submit_read = submit_write
+
+def shutdown_writer():
+    """
+    Waits for all submitted writes to finish and stops the background writer thread.
+
+    The next connection opened by `_open_connection` starts a new one.
+    """
+
+    global _WRITER
+
+    if _WRITER is not None:
+        _WRITER.shutdown(wait=True)
+        _WRITER = None
+
+def _cursor_for(connection, query):
+    """
+    Returns the cursor dedicated to a given SQL query, creating it on first use.
+
+    Parameters:
+    - connection (sqlite3.Connection): The active connection to the database.
+    - query (str): The SQL query the cursor will execute (None for the shared cursor, see `_cur`).
+
+    Returns:
+    - sqlite3.Cursor: The cursor reserved for this query on this connection.
+    """
+
+    key = (connection, query)
+    cursor = _CURSORS.get(key)
+    if cursor is None:
+        cursor = _CURSORS[key] = connection.cursor()
+    return cursor
+
+def _cur(connection):
+    """
+    Returns the cursor shared by the helpers in this file that run a single statement
+    and read its results right away, creating it on first use.
+
+    Parameters:
+    - connection (sqlite3.Connection): The active connection to the database.
+
+    Returns:
+    - sqlite3.Cursor: The shared cursor for this connection.
+    """
+
+    return _cursor_for(connection, None)
+
+def _cached_exec(connection, query, params=()):
+    """
+    Executes an SQL query on the cursor reserved for that query text.
+
+    Each distinct query gets its own long-lived cursor (see `_cursor_for`), so repeated calls
+    reuse the statement SQLite already compiled for that cursor instead of preparing it again.
+
+    Parameters:
+    - connection (sqlite3.Connection): The active connection to the database.
+    - query (str): The SQL query to execute.
+    - params (tuple): Parameters to be passed to the query (default is empty tuple)
+
+    Returns:
+    - sqlite3.Cursor: The cursor, ready for fetching results or reading rowcount.
+    """
+
+    return _cursor_for(connection, query).execute(query, params)
+
+def execute_query(query, connection, params=(), fetch="all"):
     """
     Executes an SQL query and prints the results
 
@@ -72,22 +467,108 @@ def execute_query(query, connection, params=()):
     - query (str): The SQL query to execute
     - connection: Database connection object
     - params (tuple): Parameters to be passed to the query (default is empty tuple)
+    - fetch (str): "all" for every row, "one" for the first row, "scalar" for the first column
+      of the first row (default is "all")
     
     Returns:
-    - list: Query results if successful.
+    - list: Query results if successful (a single row or value for "one"/"scalar").
     """
 
-    # Create a cursor object from the connection
-    cursor = connection.cursor()
+    # Reuse the connection's shared cursor
+    cursor = _cur(connection)
 
     try:
         cursor.execute(query, params) # Execute the query with parameters
+        if fetch == "one":
+            return cursor.fetchone() # Fetch only the first row
+        if fetch == "scalar":
+            row = cursor.fetchone()
+            return row[0] if row is not None else None # Fetch only the first value
         results = cursor.fetchall() # Fetch all the results of the query
         return results
     except sqlite3.Error as e:
         # Print an error message if the query fails
         print(f"Database error: {e}")
 
+def stream_query(query, connection, params=(), batch_size=256, tuples=False):
+    """
+    Executes an SQL query and returns its rows as an iterator instead of a list.
+
+    Rows are fetched from SQLite `batch_size` at a time while the caller iterates,
+    so the full result set is never held twice in memory.
+
+    Parameters:
+    - query (str): The SQL query to execute
+    - connection: Database connection object
+    - params (tuple): Parameters to be passed to the query (default is empty tuple)
+    - batch_size (int): Number of rows fetched per batch (default is 256)
+    - tuples (bool): Yield plain tuples instead of sqlite3.Row objects (default is False)
+
+    Returns:
+    - iterator: Query results if successful, None if the query fails.
+    """
+
+    # Create a dedicated cursor object, since the rows are read after this function returns
+    cursor = connection.cursor()
+    cursor.arraysize = batch_size
+    if tuples:
+        _as_tuples(cursor)
+
+    try:
+        cursor.execute(query, params) # Execute the query with parameters
+    except sqlite3.Error as e:
+        # Print an error message if the query fails
+        print(f"Database error: {e}")
+        return None
+
+    return _iterate_rows(cursor)
+
+def _iterate_rows(cursor):
+    """
+    Yields the rows of an executed cursor, fetching `cursor.arraysize` rows at a time.
+
+    Parameters:
+    - cursor (sqlite3.Cursor): A cursor that has already executed its query.
+    """
+
+    while rows := cursor.fetchmany():
+        yield from rows
+
+def _as_tuples(cursor):
+    """
+    Makes a cursor return plain tuples instead of the connection's sqlite3.Row objects.
+
+    Used by the functions whose rows go straight into an sg.Table, which only accepts
+    lists and tuples, so the GUI does not have to copy every row.
+
+    Parameters:
+    - cursor (sqlite3.Cursor): The cursor to change.
+
+    Returns:
+    - sqlite3.Cursor: The same cursor.
+    """
+
+    cursor.row_factory = None
+    return cursor
+
+def _db_exists(connection, query, value):
+    """
+    Runs one of the `SELECT EXISTS(...)` queries for a single value.
+
+    Database errors are not caught here: they propagate to the GUI, which reports them to the
+    user, so a failed check is never mistaken for a missing row.
+
+    Parameters:
+    - connection (sqlite3.Connection): The active connection to the database.
+    - query (str): The EXISTS query to run (one of the _SQL_*_EXISTS constants).
+    - value: The value bound to the query's placeholder.
+
+    Returns:
+    - bool: True if a matching row exists, False otherwise.
+    """
+
+    return bool(_cached_exec(connection, query, (value,)).fetchone()[0])
+
 # ------------------------ Member Functions ------------------------
 def add_member(connection, name, email, phone, address, age, membershipStartDate, membershipEndDate):
     """
@@ -108,22 +589,35 @@ def add_member(connection, name, email, phone, address, age, membershipStartDate
     - bool: False if an error occurs.
     """
     
-    # SQL query to add a new member to the database
-    query = """
-        INSERT INTO Member (name, email, phone, address, age, membershipStartDate, membershipEndDate)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
+    try:
+        with _transaction(connection): # Commits on success, rolls back on error
+            row = _cached_exec(connection, _SQL_ADD_MEMBER_RETURNING_ID,
+                               (name, email, phone, address, age, membershipStartDate, membershipEndDate)).fetchone()
+        return row[0] # Return newly generated member ID
+    except sqlite3.Error as e:
+        # Print an error message if insertion fails
+        print(f"Error adding member: {e}")
+        return False
+
+def add_members_bulk(connection, rows):
     """
+    Inserts many members into the Member table in a single transaction.
 
-    # Create a cursor object from the connection
-    cursor = connection.cursor()
+    Parameters:
+    - connection (sqlite3.Connection): The active connection to the database.
+    - rows (iterable): Tuples of (name, email, phone, address, age, membershipStartDate, membershipEndDate).
+
+    Returns:
+    - bool: True if all rows were inserted, False otherwise (nothing is inserted on failure).
+    """
 
     try:
-        cursor.execute(query, (name, email, phone, address, age, membershipStartDate, membershipEndDate))
-        connection.commit() # Commit the changes to the database
-        return cursor.lastrowid # Return newly generated member ID
+        with _transaction(connection): # One commit for the whole batch
+            connection.executemany(_SQL_ADD_MEMBER, rows)
+        return True
     except sqlite3.Error as e:
         # Print an error message if insertion fails
-        print(f"Error adding member: {e}")
+        print(f"Error adding members: {e}")
         return False
     
 def add_payment(connection, memberID, planID, amountPaid, paymentDate):
@@ -141,22 +635,61 @@ def add_payment(connection, memberID, planID, amountPaid, paymentDate):
     - bool: True if insertion succeeds, False otherwise.
     """
     
-    # SQL query to insert a payment record
-    query = """
-        INSERT INTO Payment (memberID, planID, amountPaid, paymentDate)
-        VALUES (?, ?, ?, ?)
+    try:
+        with _transaction(connection): # Commits on success, rolls back on error
+            _cached_exec(connection, _SQL_ADD_PAYMENT, (memberID, planID, amountPaid, paymentDate))
+        return True
+    except sqlite3.Error as e:
+        # Print an error message if insertion fails
+        print(f"Error adding payment: {e}")
+        return False
+
+def add_payments_bulk(connection, rows):
     """
+    Inserts many payment records into the Payment table in a single transaction.
 
-    # Create a cursor object from the connection
-    cursor = connection.cursor()
+    Parameters:
+    - connection (sqlite3.Connection): The active connection to the database.
+    - rows (iterable): Tuples of (memberID, planID, amountPaid, paymentDate).
+
+    Returns:
+    - bool: True if all rows were inserted, False otherwise (nothing is inserted on failure).
+    """
 
     try:
-        cursor.execute(query, (memberID, planID, amountPaid, paymentDate))
-        connection.commit() # Commit the changes to the database
+        with _transaction(connection): # One commit for the whole batch
+            connection.executemany(_SQL_ADD_PAYMENT, rows)
         return True
     except sqlite3.Error as e:
         # Print an error message if insertion fails
-        print(f"Error adding payment: {e}")
+        print(f"Error adding payments: {e}")
+        return False
+
+def add_member_with_payment(connection, member_fields, planID, amountPaid, paymentDate):
+    """
+    Inserts a new member and their first payment in a single transaction, so a member is
+    never left without the payment that was entered with it.
+
+    Parameters:
+    - connection (sqlite3.Connection): The active connection to the database.
+    - member_fields (tuple): (name, email, phone, address, age, membershipStartDate, membershipEndDate).
+    - planID (int): ID of the membership plan.
+    - amountPaid (float): Amount paid.
+    - paymentDate (str): Date of payment (YYYY-MM-DD).
+
+    Returns:
+    - int: New member ID if successful
+    - bool: False if an error occurs (neither row is inserted).
+    """
+
+    try:
+        with _transaction(connection): # One commit for both rows, rolls back both on error
+            member_id = _cached_exec(connection, _SQL_ADD_MEMBER_RETURNING_ID, member_fields).fetchone()[0]
+            _cached_exec(connection, _SQL_ADD_PAYMENT, (member_id, planID, amountPaid, paymentDate))
+        return member_id # Return newly generated member ID
+    except sqlite3.Error as e:
+        # Print an error message if insertion fails
+        print(f"Error adding member and payment: {e}")
         return False
 
 def update_member(connection, member_id, name, email, phone, address, age, start_date, end_date):
@@ -175,28 +708,11 @@ def update_member(connection, member_id, name, email, phone, address, age, start
     - end_date (str): Updated membership end date.
 
     Returns:
-    - bool: True if updated successfully, False otherwise.
+    - bool: True if updated successfully, False if no member has that ID.
     """
     
-    # SQL query to update the member's information
-    query = """
-        UPDATE Member
-        SET name = ?, email = ?, phone = ?, address = ?, age = ?,
-            membershipStartDate = ?, membershipEndDate = ?
-        WHERE memberID = ?
-    """
-
-    # Create a cursor object from the connection
-    cursor = connection.cursor()
-
-    try:
-        cursor.execute(query, (name, email, phone, address, age, start_date, end_date, member_id))
-        connection.commit() # Commit the changes to the database
-        return True
-    except sqlite3.Error as e:
-        # Print an error message if insertion fails
-        print(f"Error updating member: {e}")
-        return False
+    cursor = _cached_exec(connection, _SQL_UPDATE_MEMBER, (name, email, phone, address, age, start_date, end_date, member_id))
+    return cursor.rowcount > 0 # Return True if the member was updated (False if the ID does not exist)
     
 def member_exists(connection, member_id):
     """
@@ -210,51 +726,28 @@ def member_exists(connection, member_id):
     - bool: True if member exists, False otherwise.
     """
 
-    # SQL query to check if a member exists
-    query = """
-        SELECT 1 FROM Member WHERE memberID = ?
-    """
-
-    # Create a cursor object from the connection
-    cursor = connection.cursor()
-    try:
-        cursor.execute(query, (member_id,))
-        # Returns True if a member exists, False otherwise
-        return cursor.fetchone() is not None
-    except sqlite3.Error as e:
-        # Print an error message if issue occurs
-        print(f"Error checking member existence: {e}")
-        return False
+    return _db_exists(connection, _SQL_MEMBER_EXISTS, member_id)
     
 def delete_member(connection, member_id):
     """
-    Deletes a member from the Member table in the database.
+    Deletes a member, along with their attendance and payment records, from the database.
 
     Parameters:
     - connection (sqlite3.Connection): The active connection to the database.
     - member_id (int): ID of the member to delete.
 
     Returns:
-    - bool: True if deletion succeeds, False otherwise.
-    """
-
-    # SQL query to delete a member
-    query = """
-        DELETE FROM Member
-        WHERE memberID =?
+    - bool: True if deletion succeeds, False if no member has that ID.
     """
 
-    # Create a cursor object from the connection
-    cursor = connection.cursor()
-
-    try:
-        cursor.execute(query, (member_id,))
-        connection.commit() # Commit the changes to the database
-        return True
-    except sqlite3.Error as e:
-        # Print an error message if issue occurs
-        print(f"Error deleting member: {e}")
-        return False
+    # Remove the member's attendance and payment rows first, since foreign keys are enforced
+    # (databases built from the current crtdb.sql cascade these deletes themselves)
+    with _transaction(connection): # Commits on success, rolls back on error
+        _cached_exec(connection, _SQL_DELETE_MEMBER_ATTENDS, (member_id,))
+        _cached_exec(connection, _SQL_DELETE_MEMBER_PAYMENTS, (member_id,))
+        cursor = _cached_exec(connection, _SQL_DELETE_MEMBER, (member_id,))
+    invalidate_attendance_cache() # the cached attendance counts may have changed
+    return cursor.rowcount > 0 # Return True if the member was deleted (False if the ID does not exist)
     
 # ------------------------ Class Functions ------------------------
 def add_class(connection, className, classType, duration, classCapacity, instructorID, gymID):
@@ -275,19 +768,10 @@ def add_class(connection, className, classType, duration, classCapacity, instruc
     - bool: False if addition fails.
     """
 
-    # SQL query to add a class to the database
-    query = """
-        INSERT INTO Class (className, classType, duration, classCapacity, instructorID, gymID)
-        VALUES (?, ?, ?, ?, ?, ?)
-    """
-
-    # Create a cursor object from the connection
-    cursor = connection.cursor()
-
     try:
-        cursor.execute(query, (className, classType, duration, classCapacity, instructorID, gymID))
-        connection.commit() # Commit the changes to the database
-        return cursor.lastrowid # Return the ID of the new class
+        row = _cached_exec(connection, _SQL_ADD_CLASS, (className, classType, duration, classCapacity, instructorID, gymID)).fetchone()
+        invalidate_attendance_cache() # the cached attendance counts may have changed
+        return row[0] # Return the ID of the new class
     except sqlite3.Error as e:
         # Print error message if insertion fails
         print(f"Error adding member: {e}")
@@ -308,58 +792,39 @@ def update_class(connection, classID, className, classType, duration, classCapac
     - gymID (int): New gym ID.
 
     Returns:
-    - bool: True if updated successfully, False otherwise.
+    - bool: True if updated successfully, False if no class has that ID.
     """
     
-    # SQL query to update a class's information
-    query = """
-        UPDATE Class
-        SET className = ?, classType = ?, duration = ?, classCapacity = ?,
-            instructorID = ?, gymID = ?
-        WHERE classID = ?
-    """
+    cursor = _cached_exec(connection, _SQL_UPDATE_CLASS, (className, classType, duration, classCapacity, instructorID, gymID, classID))
+    invalidate_attendance_cache() # the cached attendance counts may have changed
+    return cursor.rowcount > 0 # Return True if the class was updated (False if the ID does not exist)
 
-    # Create a cursor object from the connection
-    cursor = connection.cursor()
-
-    try:
-        cursor.execute(query, (className, classType, duration, classCapacity, instructorID, gymID, classID))
-        connection.commit() # Commit the changes to the databaes
-        return True
-    except sqlite3.Error as e:
-        # Print error message if insertion fails
-        print(f"Error updating member: {e}")
-        return False
-
-def delete_class(connection, class_id):
+def delete_class(connection, class_id, new_class_id=None):
     """
-    Deletes a class from the Class table in the database.
+    Deletes a class from the Class table in the database, optionally moving its members to
+    another class first. Moving the members, removing any remaining attendance rows and
+    deleting the class happen in one transaction.
 
     Parameters:
     - connection (sqlite3.Connection): The active connection to the database.
     - class_id (int): ID of the class to delete.
+    - new_class_id (int): ID of the class to move the members to (default is None, which
+      deletes the class's attendance rows along with it).
 
     Returns:
-    - bool: True if deletion succeeds, False otherwise.
+    - bool: True if deletion succeeds, False if no class has that ID
+      (nothing is changed if a database error is raised).
     """
 
-    # SQL query to delete a class
-    query = """
-        DELETE FROM Class
-        WHERE classID = ?
-    """
-
-    # Create a cursor object from the connection
-    cursor = connection.cursor()
-
-    try:
-        cursor.execute(query, (class_id,))
-        connection.commit() # Commit the changes to the database
-        return cursor.rowcount > 0 # Return True if the class was deleted 
-    except sqlite3.Error as e:
-        # Print an error message if deletion fails
-        print(f"Error deleting class {e}")
-        return False
+    with _transaction(connection): # Commits on success, rolls back on error
+        if new_class_id is not None:
+            _cached_exec(connection, _SQL_MOVE_MEMBERS, (new_class_id, class_id))
+        # Databases built from the current crtdb.sql cascade this delete themselves,
+        # older ones need the attendance rows removed explicitly
+        _cached_exec(connection, _SQL_DELETE_CLASS_ATTENDS, (class_id,))
+        cursor = _cached_exec(connection, _SQL_DELETE_CLASS, (class_id,))
+    invalidate_attendance_cache() # the cached attendance counts may have changed
+    return cursor.rowcount > 0 # Return True if the class was deleted 
 
 def get_all_classes(connection):
     """
@@ -369,22 +834,19 @@ def get_all_classes(connection):
     - connection (sqlite3.Connection): The active connection to the database.
 
     Returns:
-    - list: List of all classes.
+    - iterator: Iterator over all classes.
     """
 
-    # SQL query to retrieve all class records
-    query = """
-        SELECT classID, className, classType, duration, classCapacity, instructorID, gymID
-        FROM Class
-    """
-
-    # Execute query and return the results
-    return execute_query(query, connection)
+    # Execute query and return an iterator over the results
+    return stream_query(_SQL_GET_ALL_CLASSES, connection, tuples=True)
 
 def get_classes_with_attendance(connection):
     """
     Retrieves classes along with the number of attendees.
 
+    The result is reused for up to _ATTENDANCE_TTL seconds, and is dropped earlier by any
+    change to classes or attendance made through this file (see invalidate_attendance_cache).
+
     Parameters:
     - connection (sqlite3.Connection): The active connection to the database.
 
@@ -392,26 +854,25 @@ def get_classes_with_attendance(connection):
     - list: List of all classes with their attendance counts.
     """
 
-    # SQL query to retrieve class details and number of attendees
-    query = """
-        SELECT
-            c.classID,
-            c.className,
-            c.classType,
-            c.duration,
-            c.classCapacity,
-            COUNT (a.memberID) AS num_attendees
-        FROM Class c
-        LEFT JOIN Attends a ON c.classID = a.classID
-        GROUP BY c.classID
+    # Return the cached result if it is recent enough
+    cached = _ATTENDANCE.get(connection)
+    if cached is not None and time.monotonic() - cached[0] < _ATTENDANCE_TTL:
+        return cached[1]
+
+    # Execute the query, cache and return the results
+    cursor = _as_tuples(_cached_exec(connection, _SQL_GET_CLASSES_WITH_ATTENDANCE))
+    results = cursor.fetchall()
+    _ATTENDANCE[connection] = (time.monotonic(), results)
+    return results
+
+def invalidate_attendance_cache():
     """
+    Drops the cached class attendance counts so the next lookup queries them again.
 
-    # Create a cursor object from the connection
-    cursor = connection.cursor()
+    Called after any change to Class or Attends rows.
+    """
 
-    # Execute the query and return the results
-    cursor.execute(query)
-    return cursor.fetchall()
+    _ATTENDANCE.clear()
 
 def class_has_members(connection, class_id):
     """
@@ -425,17 +886,8 @@ def class_has_members(connection, class_id):
     - bool: True if class has registered members, False otherwise.
     """
 
-    # SQl query to count the members registered for a specific class
-    query = """
-        SELECT COUNT(*) FROM Attends
-        WHERE classID = ?
-    """
-
-    # Create a cursor object from the connection
-    cursor = connection.cursor()
-
     # Execute the query and fetch the results
-    cursor.execute(query, (class_id,))
+    cursor = _cached_exec(connection, _SQL_CLASS_HAS_MEMBERS, (class_id,))
     result = cursor.fetchone()
     return result[0] > 0 # Returns True if members are registered to the class
 
@@ -452,19 +904,10 @@ def move_members(connection, old_classID, new_classID):
     - bool: True if any members were moved, False otherwise.
     """
 
-    # SQl query to update the classID for all members in the old class
-    query = """
-        UPDATE Attends
-        SET classID = ?
-        WHERE classID = ?
-    """
-
-    # Create a cursor object from the connection
-    cursor = connection.cursor()
-
     try:
-        cursor.execute(query, (new_classID, old_classID))
-        connection.commit() # Commit the changes to the database
+        with _transaction(connection): # Commits on success, rolls back on error
+            cursor = _cached_exec(connection, _SQL_MOVE_MEMBERS, (new_classID, old_classID))
+        invalidate_attendance_cache() # the cached attendance counts may have changed
         return cursor.rowcount > 0 # Returns True if members were successfully moved
     except sqlite3.Error as e:
         print(f"Error moving members: {e}")
@@ -482,15 +925,7 @@ def check_email_exists(connection, email):
     - bool: True if email exists, False otherwise
     """
 
-    # SQL query to check if email address exists in the Member table
-    query = """
-        SELECT 1 FROM Member
-        WHERE email = ?
-    """
-
-    # Execute the query and return the results
-    result = execute_query(query, connection, (email,))
-    return len(result) > 0
+    return _db_exists(connection, _SQL_CHECK_EMAIL_EXISTS, email)
 
 def class_exists(connection, class_id):
     """
@@ -504,22 +939,7 @@ def class_exists(connection, class_id):
     - bool: True if class exists, False otherwise.
     """
 
-    # SQL query to check if the class exists in the Class table
-    query = """
-        SELECT 1 FROM Class WHERE classID = ?
-    """
-
-    # Create a cursor object from the connection
-    cursor = connection.cursor()
-
-    try:
-        cursor.execute(query, (class_id,))
-        # Returns True if a class exists, False otherwise
-        return cursor.fetchone() is not None
-    except sqlite3.Error as e:
-        # Print error message if issue occurs
-        print(f"Error checking member existence: {e}")
-        return False
+    return _db_exists(connection, _SQL_CLASS_EXISTS, class_id)
 
 def get_members_and_membership_plan(connection):
     """
@@ -529,24 +949,11 @@ def get_members_and_membership_plan(connection):
     - connection (sqlite3.Connection): The active connection to the database.
 
     Returns:
-    - list: List of all members with their names, email, ages, and plan IDs.
+    - iterator: Iterator over all members with their names, email, ages, and plan IDs.
     """
 
-    # SQl query to select members and their associated membership plan details
-    query = """
-        SELECT
-            m.memberID,
-            m.name, 
-            m.email, 
-            m.age,
-            mp.planId
-        FROM Member m 
-        JOIN Payment p ON m.memberID = p.memberID
-        JOIN MembershipPlan mp ON p.planId = mp.planId
-    """
-
-    # Execute the query and return the result
-    return execute_query(query, connection)
+    # Execute the query and return an iterator over the result
+    return stream_query(_SQL_GET_MEMBERS_AND_MEMBERSHIP_PLAN, connection, tuples=True)
 
 def membership_plan_exists(connection, mempership_id) :
     """
@@ -560,22 +967,7 @@ def membership_plan_exists(connection, mempership_id) :
     - bool: True if plan exists, False otherwise.
     """
 
-    # SQL query to check if the plan exists in the MembershipPlan table
-    query = """
-        SELECT 1 FROM MembershipPlan WHERE planId = ?
-    """
-
-    # Create a cursor object from the connection
-    cursor = connection.cursor()
-
-    try:
-        cursor.execute(query, (mempership_id,))
-        # Returns True if the equipment exists, False otherwise
-        return cursor.fetchone() is not None
-    except sqlite3.Error as e:
-        # Print error message if issue occurs
-        print(f"Error checking member existence: {e}")
-        return False
+    return _db_exists(connection, _SQL_MEMBERSHIP_PLAN_EXISTS, mempership_id)
     
 def get_all_membership_plan_ids(connection):
     """
@@ -588,15 +980,88 @@ def get_all_membership_plan_ids(connection):
     - list: List of all plan id's.
     """
 
-    # SQL query to retrieve all plan id's
-    query = """
-        SELECT planID
-        FROM MembershipPlan
-    """
-
     # Execute query and return the results
-    return execute_query(query, connection)
+    return execute_query(_SQL_GET_ALL_MEMBERSHIP_PLAN_IDS, connection)
     
+def _id_set(connection, table, refresh=False):
+    """
+    Returns the IDs of every row of a small reference table, loading them from the database
+    only once per session.
+
+    Parameters:
+    - connection (sqlite3.Connection): The active connection to the database.
+    - table (str): Table to load (one of the keys of _ID_COLUMNS).
+    - refresh (bool): Reload the IDs even if they are already cached (default is False).
+
+    Returns:
+    - frozenset: All IDs of the table.
+
+    Database errors are not caught here (see `_db_exists`), so a failed load is never mistaken
+    for a table without IDs; nothing is cached and the next call tries again.
+    """
+
+    if refresh or table not in _ID_SETS:
+        # Table and column come from _ID_COLUMNS, so they are safe to insert into the SQL text
+        column = _ID_COLUMNS[table]
+        rows = _cached_exec(connection, f"SELECT {column} FROM {table}").fetchall()
+        _ID_SETS[table] = frozenset(row[0] for row in rows)
+    return _ID_SETS[table]
+
+def get_plan_id_set(connection, refresh=False):
+    """
+    Returns the IDs of all membership plans, loading them from the database only once.
+
+    The MembershipPlan table is small and not changed by the GUI, so the IDs are kept in memory
+    and membership checks against them need no query. Pass refresh=True (or call
+    invalidate_reference_caches() after any change to MembershipPlan) to reload them.
+
+    Parameters:
+    - connection (sqlite3.Connection): The active connection to the database.
+    - refresh (bool): Reload the IDs even if they are already cached (default is False).
+
+    Returns:
+    - frozenset: All plan IDs (database errors propagate, see `_id_set`).
+    """
+
+    return _id_set(connection, "MembershipPlan", refresh)
+
+def get_instructor_id_set(connection, refresh=False):
+    """
+    Returns the IDs of all instructors, loading them from the database only once.
+
+    Parameters:
+    - connection (sqlite3.Connection): The active connection to the database.
+    - refresh (bool): Reload the IDs even if they are already cached (default is False).
+
+    Returns:
+    - frozenset: All instructor IDs (database errors propagate, see `_id_set`).
+    """
+
+    return _id_set(connection, "Instructor", refresh)
+
+def get_gym_id_set(connection, refresh=False):
+    """
+    Returns the IDs of all gym facilities, loading them from the database only once.
+
+    Parameters:
+    - connection (sqlite3.Connection): The active connection to the database.
+    - refresh (bool): Reload the IDs even if they are already cached (default is False).
+
+    Returns:
+    - frozenset: All gym IDs (database errors propagate, see `_id_set`).
+    """
+
+    return _id_set(connection, "GymFacility", refresh)
+
+def invalidate_reference_caches():
+    """
+    Drops the cached plan, instructor and gym IDs so the next lookup reloads them.
+
+    Call this after any INSERT or DELETE on MembershipPlan, Instructor or GymFacility.
+    """
+
+    _ID_SETS.clear()
+
 def get_members_in_class(connection, class_id):
     """
     Retrieves all members registered to a specific class.
@@ -609,23 +1074,8 @@ def get_members_in_class(connection, class_id):
     - list: List of members attending the specified class.
     """
 
-    # SQL wuery to seelct members registered for a specific class
-    query = """
-        SELECT 
-            m.memberID,
-            m.name,
-            m.email,
-            m.age
-        FROM Member m
-        INNER JOIN Attends a ON m.memberID = a.memberID
-        WHERE a.classID = ?
-    """
-
-    # Create a cursor object from the connection
-    cursor = connection.cursor()
-
     # Execute the query and fetch the results
-    cursor.execute(query, (class_id,))
+    cursor = _as_tuples(_cached_exec(connection, _SQL_GET_MEMBERS_IN_CLASS, (class_id,)))
     return cursor.fetchall()
 
 def instructor_exists(connection, instructor_id):
@@ -640,22 +1090,7 @@ def instructor_exists(connection, instructor_id):
     - bool: True if instructor exists, False otherwise.
     """
 
-    # SQL query to check if the instructor exists in the Instructor table
-    query = """
-        SELECT 1 FROM Instructor WHERE instructorID = ?
-    """
-
-    # Create a cursor object from the connection
-    cursor = connection.cursor()
-
-    try:
-        cursor.execute(query, (instructor_id,))
-        # Returns True if instructor exists, False otherwise
-        return cursor.fetchone() is not None
-    except sqlite3.Error as e:
-        # Print error message if issue occurs
-        print(f"Error checking instructor existence: {e}")
-        return False
+    return _db_exists(connection, _SQL_INSTRUCTOR_EXISTS, instructor_id)
     
 def gym_exists(connection, gym_id):
     """
@@ -669,22 +1104,7 @@ def gym_exists(connection, gym_id):
     - bool: True if ym exists, False otherwise.
     """
 
-    # SQl query to check if the gym exists in the GymFacility table
-    query = """
-        SELECT 1 FROM GymFacility WHERE gymID = ?
-    """
-
-    # Create a cursor object from the connection
-    cursor = connection.cursor()
-
-    try:
-        cursor.execute(query, (gym_id,))
-        # Returns True if the gym exists, False otherwise
-        return cursor.fetchone() is not None
-    except sqlite3.Error as e:
-        # Print error message if issue occurs
-        print(f"Error checking gym existence: {e}")
-        return False
+    return _db_exists(connection, _SQL_GYM_EXISTS, gym_id)
     
 # ------------------------ Equipment Functions ------------------------
 
@@ -696,13 +1116,11 @@ def get_all_equipment(connection):
     - connection (sqlite3.Connection): The active connection to the database.
 
     Returns:
-    - list: List of all equipment.
+    - iterator: Iterator over all equipment.
     """
-    # query to get all equipment
-    query = """SELECT * FROM Equipment"""
 
-    # return the equipment
-    return execute_query(query, connection)
+    # return an iterator over the equipment
+    return stream_query(_SQL_GET_ALL_EQUIPMENT, connection, tuples=True)
 
 def add_equipment(connection, equipmentName, equipmentType, quantity, gymID):
     """
@@ -720,22 +1138,31 @@ def add_equipment(connection, equipmentName, equipmentType, quantity, gymID):
     - bool: False if addition fails.
     """
 
-    # SQL query to add a piece of equipment to the database
-    query = """
-        INSERT INTO Equipment (name, classType, quantity, gymID)
-        VALUES (?, ?, ?, ?)
+    # Insert the single row through the bulk path
+    if not add_equipment_bulk(connection, [(equipmentName, equipmentType, quantity, gymID)]):
+        return False
+    # executemany does not set lastrowid, so ask SQLite for the ID of the new equipment
+    return execute_query(_SQL_LAST_INSERT_ID, connection, fetch="scalar")
+
+def add_equipment_bulk(connection, rows):
     """
+    Inserts many pieces of equipment into the Equipment table in a single transaction.
 
-    # Create a cursor object from the connection
-    cursor = connection.cursor()
+    Parameters:
+    - connection (sqlite3.Connection): The active connection to the database.
+    - rows (iterable): Tuples of (equipmentName, equipmentType, quantity, gymID).
+
+    Returns:
+    - bool: True if all rows were inserted, False otherwise (nothing is inserted on failure).
+    """
 
     try:
-        cursor.execute(query, (equipmentName, equipmentType, quantity, gymID))
-        connection.commit() # Commit the changes to the database
-        return cursor.lastrowid # Return the ID of the new equipment
+        with _transaction(connection): # One commit for the whole batch
+            connection.executemany(_SQL_ADD_EQUIPMENT, rows)
+        return True
     except sqlite3.Error as e:
         # Print error message if insertion fails
-        print(f"Error adding member: {e}")
+        print(f"Error adding equipment: {e}")
         return False
     
 def update_equipment(connection, equipmentID, equipmentName, equipmentType, quantity, gymID):
@@ -751,28 +1178,39 @@ def update_equipment(connection, equipmentID, equipmentName, equipmentType, quan
     - gymID (int): New gym ID.
 
     Returns:
-    - bool: True if updated successfully, False otherwise.
+    - bool: True if updated successfully, False if no piece of equipment has that ID.
     """
     
-    # SQL query to update a class's information
-    query = """
-        UPDATE Equipment
-        SET name = ?, classType = ?, quantity = ?, gymID = ?
-        WHERE equipmentID = ?
+    cursor = _cached_exec(connection, _SQL_UPDATE_EQUIPMENT, (equipmentName, equipmentType, quantity, gymID, equipmentID))
+    return cursor.rowcount > 0 # Return True if the equipment was updated (False if the ID does not exist)
+    
+def upsert_equipment(connection, equipmentID, equipmentName, equipmentType, quantity, gymID):
     """
+    Adds a piece of equipment, or updates it if the given equipment ID already exists,
+    using a single INSERT ... ON CONFLICT statement.
 
-    # Create a cursor object from the connection
-    cursor = connection.cursor()
+    Parameters:
+    - connection (sqlite3.Connection): The active connection to the database.
+    - equipmentID (int): ID of the equipment to update, or None to add a new piece of equipment.
+    - equipmentName (str): Name of the equipment.
+    - equipmentType (str): Type of the equipment (Cardio, Strength, etc.).
+    - quantity (int): quantity of the piece of equipment.
+    - gymID (int): ID of the gym facility.
+
+    Returns:
+    - int: ID of the added or updated equipment if successful.
+    - bool: False if an error occurs.
+    """
 
     try:
-        cursor.execute(query, (equipmentName, equipmentType, quantity, gymID, equipmentID))
-        connection.commit() # Commit the changes to the databaes
-        return True
+        row = _cached_exec(connection, _SQL_UPSERT_EQUIPMENT,
+                           (equipmentID, equipmentName, equipmentType, quantity, gymID)).fetchone()
+        return row[0] # Return the ID of the equipment
     except sqlite3.Error as e:
-        # Print error message if insertion fails
-        print(f"Error updating equipment: {e}")
+        # Print error message if the insert or update fails
+        print(f"Error saving equipment: {e}")
         return False
-    
+
 def delete_equipment(connection, equipment_id):
     """
     Deletes a piece of equipment from the Equipment table in the database.
@@ -782,26 +1220,11 @@ def delete_equipment(connection, equipment_id):
     - equipment_id (int): ID of the equipment to delete.
 
     Returns:
-    - bool: True if deletion succeeds, False otherwise.
+    - bool: True if deletion succeeds, False if no piece of equipment has that ID.
     """
 
-    # SQL query to delete a piece of a equipment
-    query = """
-        DELETE FROM Equipment
-        WHERE equipmentID = ?
-    """
-
-    # Create a cursor object from the connection
-    cursor = connection.cursor()
-
-    try:
-        cursor.execute(query, (equipment_id,))
-        connection.commit() # Commit the changes to the database
-        return True
-    except sqlite3.Error as e:
-        # Print an error message if issue occurs
-        print(f"Error deleting member: {e}")
-        return False
+    cursor = _cached_exec(connection, _SQL_DELETE_EQUIPMENT, (equipment_id,))
+    return cursor.rowcount > 0 # Return True if the equipment was deleted (False if the ID does not exist)
     
 def equipment_exists(connection, equipment_id):
     """
@@ -815,20 +1238,5 @@ def equipment_exists(connection, equipment_id):
     - bool: True if class exists, False otherwise.
     """
 
-    # SQL query to check if the equipment exists in the Equipment table
-    query = """
-        SELECT 1 FROM Equipment WHERE equipmentID = ?
-    """
-
-    # Create a cursor object from the connection
-    cursor = connection.cursor()
-
-    try:
-        cursor.execute(query, (equipment_id,))
-        # Returns True if the equipment exists, False otherwise
-        return cursor.fetchone() is not None
-    except sqlite3.Error as e:
-        # Print error message if issue occurs
-        print(f"Error checking member existence: {e}")
-        return False
+    return _db_exists(connection, _SQL_EQUIPMENT_EXISTS, equipment_id)
 
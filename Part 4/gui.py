@@ -17,6 +17,11 @@ Date: 04/28/2025
 Last Updated: 4/28/2025
 """
 import PySimpleGUI as sg 
+import sqlite3
+from collections import deque
+from concurrent.futures import wait
+from itertools import islice
+import time
 import file
 
 # sg.theme('DarkBlue')
@@ -26,6 +31,12 @@ sg.theme('Black')
 DB_NAME = "XYZGym.sqlite" # Fixed database name
 OFFERED_CLASSES = ['Yoga', 'Zumba', 'HIIT', 'Weights'] # define the valid class names
 EQUIPMENT_TYPES = ['Cardio', 'Strength', 'Flexibility', 'Recovery']
+PAGE_SIZE = 10 # rows read per page by the paged table views
+DEBOUNCE_SECONDS = 0.2 # a menu action repeated within this time of the last one finishing is ignored
+
+_PENDING_EQUIPMENT = deque() # equipment rows queued by add_equipment, inserted by flush_pending_equipment
+_LAST_ACTION = (None, 0.0) # (action, time it finished) of the last action run by run_action
+_FORMS = {} # input form windows by title, hidden between uses by the form functions
 
 def logout_and_exit(connection):
     """
@@ -35,9 +46,165 @@ def logout_and_exit(connection):
     - connection (sqlite3.Connection): The active connection to the database.
     """
 
-    connection.close()
+    file.close_connection(connection) # finishes pending writes before closing
+    close_forms()
     exit()
 
+def run_action(action, connection):
+    """
+    Runs a menu action, reporting any database error in a popup instead of ending the program.
+
+    The database helpers let unexpected SQLite errors propagate so they are not mistaken for
+    "not found" results; this is the single place where they are shown to the user.
+
+    A click on the same action within DEBOUNCE_SECONDS of it finishing (e.g. the second half
+    of a double-click, queued while the action's window was open) is ignored.
+
+    Parameters:
+    - action (callable): The menu action to run (e.g. add_new_member).
+    - connection (sqlite3.Connection): The active connection to the database.
+    """
+
+    global _LAST_ACTION
+
+    last_action, last_time = _LAST_ACTION
+    if action is last_action and time.monotonic() - last_time < DEBOUNCE_SECONDS:
+        return
+
+    try:
+        action(connection)
+    except sqlite3.Error as e:
+        # The error ends the action before its form is hidden, so hide it here
+        for window in _FORMS.values():
+            if not window.was_closed():
+                window.hide()
+        sg.popup_error(f"Database error: {e}")
+    finally:
+        _LAST_ACTION = (action, time.monotonic())
+
+def wait_for(window, future):
+    """
+    Keeps a window responsive while a background database call finishes.
+
+    The window's buttons are disabled while waiting, so no click is lost. A close attempt made
+    while waiting is sent to the window again once the call has finished, so the caller's event
+    loop still sees it; if the window is destroyed instead, the caller can tell from
+    `window.was_closed()`.
+
+    Parameters:
+    - window (sg.Window): The window to keep refreshing, or None to show a loading
+      animation while waiting.
+    - future (concurrent.futures.Future): The pending call returned by `file.submit_write`
+      or `file.submit_read`.
+
+    Returns:
+    - The return value of the database function.
+    """
+
+    close_attempted = False # the user tried to close the window while waiting
+    destroyed = False # the window was closed while waiting
+
+    # Disable the buttons that are enabled now, they are enabled again once the call finishes
+    buttons = []
+    if window is not None:
+        buttons = [element for element in window.element_list()
+                   if isinstance(element, sg.Button) and not element.Disabled]
+        for button in buttons:
+            button.update(disabled=True)
+
+    try:
+        while not future.done():
+            if window is None:
+                sg.popup_animated(sg.DEFAULT_BASE64_LOADING_GIF, "Loading...", time_between_frames=50)
+                wait([future], timeout=0.05)
+            elif destroyed:
+                wait([future]) # the window is gone, there is nothing left to refresh
+            else:
+                event, _ = window.read(timeout=50)
+                if event == sg.WIN_CLOSED:
+                    destroyed = True
+                elif event == sg.WINDOW_CLOSE_ATTEMPTED_EVENT:
+                    close_attempted = True
+    finally:
+        if window is None:
+            sg.popup_animated(None) # close the loading animation
+        elif not destroyed:
+            for button in buttons:
+                button.update(disabled=False)
+            # Hand the close attempt to the caller's event loop
+            if close_attempted:
+                window.write_event_value(sg.WINDOW_CLOSE_ATTEMPTED_EVENT, None)
+    return future.result()
+
+def reuse_form(title):
+    """
+    Shows the window of an input form again, with its fields cleared.
+
+    Forms are built once and hidden when they are done (see `create_form`), so opening one
+    again does not rebuild its layout and widgets.
+
+    Parameters:
+    - title (str): Title of the form's window.
+
+    Returns:
+    - sg.Window: The form's window, or None if it has not been built yet.
+    """
+
+    window = _FORMS.get(title)
+    if window is None or window.was_closed():
+        return None
+
+    # Drop events left over from the last use (e.g. a close attempt made while it was saving)
+    while window.read(timeout=0)[0] != sg.TIMEOUT_EVENT:
+        pass
+
+    # Clear what was entered the last time the form was used
+    for element in window.key_dict.values():
+        if isinstance(element, (sg.Input, sg.Combo)):
+            element.update('')
+    window.un_hide()
+    return window
+
+def create_form(title, layout):
+    """
+    Builds the window of an input form and keeps it for `reuse_form`.
+
+    Closing the window with its title bar button is reported as
+    sg.WINDOW_CLOSE_ATTEMPTED_EVENT instead of destroying it, so it can be hidden and reused.
+
+    Parameters:
+    - title (str): Title of the form's window.
+    - layout (list): The form's layout.
+
+    Returns:
+    - sg.Window: The new window.
+    """
+
+    window = _FORMS[title] = sg.Window(title, layout, finalize=True, enable_close_attempted_event=True)
+    return window
+
+def close_forms():
+    """
+    Closes every input form window kept by `create_form`.
+    """
+
+    for window in _FORMS.values():
+        window.close()
+    _FORMS.clear()
+
+def read_page(rows):
+    """
+    Reads the next page of a streamed query result.
+
+    Parameters:
+    - rows (iterator): Rows returned by one of the streaming functions in file.py.
+
+    Returns:
+    - list: Up to PAGE_SIZE rows.
+    """
+
+    return list(islice(rows, PAGE_SIZE))
+
 def show_members_and_membership_plan(connection):
     """
     Displays a list of all members along with their corresponding membership plan and details.
@@ -58,8 +225,8 @@ def show_members_and_membership_plan(connection):
         sg.popup("Database query failed or no members found.")
         return
     
-    # Converts each row into a list for easier handling
-    results = [list(row) for row in results]
+    # Read the streamed rows (sg.Table accepts the row tuples as they are)
+    results = list(results)
 
     # Message if the result is empty
     if not results:
@@ -104,30 +271,31 @@ def add_new_member(connection):
     - connection (sqlite3.Connection): The active connection to the database.
     """
 
-    # Define the form layout with input fields and buttons
-    layout = [
-        [sg.Text('Name'), sg.InputText(key='-NAME-')],
-        [sg.Text('Email'), sg.InputText(key='-EMAIL-')],
-        [sg.Text('Phone'), sg.InputText(key='-PHONE-')],
-        [sg.Text('Address'), sg.InputText(key='-ADDRESS-')],
-        [sg.Text('Age'), sg.InputText(key='-AGE-')],
-        [sg.Text('Start Date (YYYY-MM-DD)'), sg.InputText(key='-START-')],
-        [sg.Text('End Date (YYYY-MM-DD)'), sg.InputText(key='-END-')],
-        [sg.Text('Plan ID'), sg.InputText(key='-PLANID-')],
-        [sg.Text('Amount Paid'), sg.InputText(key='-AMOUNT-')],
-        [sg.Text('Payment Date (YYYY-MM-DD)'), sg.InputText(key='-PAYDATE-')],
-        [sg.Button('Submit'), sg.Button('Cancel')]
-    ]
-
-    # Create the input form window
-    window = sg.Window('Add New Member', layout)
+    # Reuse the form's window if it was opened before, otherwise build it
+    window = reuse_form('Add New Member')
+    if window is None:
+        # Define the form layout with input fields and buttons
+        layout = [
+            [sg.Text('Name'), sg.InputText(key='-NAME-')],
+            [sg.Text('Email'), sg.InputText(key='-EMAIL-')],
+            [sg.Text('Phone'), sg.InputText(key='-PHONE-')],
+            [sg.Text('Address'), sg.InputText(key='-ADDRESS-')],
+            [sg.Text('Age'), sg.InputText(key='-AGE-')],
+            [sg.Text('Start Date (YYYY-MM-DD)'), sg.InputText(key='-START-')],
+            [sg.Text('End Date (YYYY-MM-DD)'), sg.InputText(key='-END-')],
+            [sg.Text('Plan ID'), sg.InputText(key='-PLANID-')],
+            [sg.Text('Amount Paid'), sg.InputText(key='-AMOUNT-')],
+            [sg.Text('Payment Date (YYYY-MM-DD)'), sg.InputText(key='-PAYDATE-')],
+            [sg.Button('Submit'), sg.Button('Cancel')]
+        ]
+        window = create_form('Add New Member', layout)
     
     while True:
         # Read user input and event
         event, values = window.read()
         
         # If the user closes the window or clicks Cancel
-        if event in (sg.WIN_CLOSED, 'Cancel'):
+        if event in (sg.WIN_CLOSED, sg.WINDOW_CLOSE_ATTEMPTED_EVENT, 'Cancel'):
             break
         elif event == 'Submit':                
                 # Retreive the form values
@@ -162,10 +330,11 @@ def add_new_member(connection):
                     continue
                 
                 # Check if selected membership plan id exists
-                if not file.membership_plan_exists(connection, plan_id):
+                plans = file.get_plan_id_set(connection)
+                if plan_id not in plans:
                     sg.popup_error(
                         "Please enter a valid membership plan id. Options: \n",
-                        *list(file.get_all_membership_plan_ids(connection))
+                        *sorted(plans)
                     )
                     continue
 
@@ -177,21 +346,19 @@ def add_new_member(connection):
                     sg.popup_error("Please fill in all fields.")
                     continue
                 
-        # Try to add the member to the database
-        member_id = file.add_member(connection, name, email, phone, address, int(age), start_date, end_date)
+        # Try to add the member and their payment to the database in one transaction
+        member_id = wait_for(window, file.submit_write(
+            file.add_member_with_payment, connection,
+            (name, email, phone, address, age, start_date, end_date),
+            plan_id, amount_paid, payment_date))
         if member_id:
-            # If member added, attempt to record payment
-            success = file.add_payment(connection, member_id, int(plan_id), float(amount_paid), payment_date)
-            if success:
-                sg.popup("Member and payment added successfully!")
-                break
-            else:
-                sg.popup_error("Member added but payment failed.")
+            sg.popup("Member and payment added successfully!")
+            break
         else:
-            sg.popup_error("Failed to add member.")
+            sg.popup_error("Failed to add member and payment.")
 
-    # Close the form window
-    window.close()
+    # Hide the window until the form is opened again
+    window.hide()
 
 def update_member(connection):
     """
@@ -205,36 +372,36 @@ def update_member(connection):
     - connection (sqlite2.Connection): The active connection to the database.
     """
 
-    # Define the layout for updating member information
-    layout = [
-        [sg.Text('Enter Member ID to update'), sg.InputText(key='-ID-')],
-        [sg.Text('New Name'), sg.InputText(key='-NAME-')],
-        [sg.Text('New Email'), sg.InputText(key='-EMAIL-')],
-        [sg.Text('New Phone'), sg.InputText(key='-PHONE-')],
-        [sg.Text('New Address'), sg.InputText(key='-ADDRESS-')],
-        [sg.Text('New Age'), sg.InputText(key='-AGE-')],
-        [sg.Text('New Start Date (YYYY-MM-DD)'), sg.InputText(key='-START-')],
-        [sg.Text('New End Date (YYYY-MM-DD)'), sg.InputText(key='-END-')],
-        [sg.Button('Update'), sg.Button('Cancel')]
-    ]
-
-    # Create the window
-    window = sg.Window('Update Member', layout)
+    # Reuse the form's window if it was opened before, otherwise build it
+    window = reuse_form('Update Member')
+    if window is None:
+        # Define the layout for updating member information
+        layout = [
+            [sg.Text('Enter Member ID to update'), sg.InputText(key='-ID-')],
+            [sg.Text('New Name'), sg.InputText(key='-NAME-')],
+            [sg.Text('New Email'), sg.InputText(key='-EMAIL-')],
+            [sg.Text('New Phone'), sg.InputText(key='-PHONE-')],
+            [sg.Text('New Address'), sg.InputText(key='-ADDRESS-')],
+            [sg.Text('New Age'), sg.InputText(key='-AGE-')],
+            [sg.Text('New Start Date (YYYY-MM-DD)'), sg.InputText(key='-START-')],
+            [sg.Text('New End Date (YYYY-MM-DD)'), sg.InputText(key='-END-')],
+            [sg.Button('Update'), sg.Button('Cancel')]
+        ]
+        window = create_form('Update Member', layout)
 
     while True:
         # Read user input
         event, values = window.read()
         # If the user closes the window or clicks Cancel
-        if event in (sg.WIN_CLOSED, 'Cancel'):
+        if event in (sg.WIN_CLOSED, sg.WINDOW_CLOSE_ATTEMPTED_EVENT, 'Cancel'):
             break
         elif event == "Update":
             try:
                 # Get and validate member ID
-                member_id = int(values['-ID-'])
+                member_id = is_integer(values['-ID-'], "member id")
 
-                # Check if the member exists
-                if not file.member_exists(connection, member_id):
-                    sg.popup_error("No member found with that ID.")
+                # make sure id was valid
+                if member_id is None:
                     continue
 
                 # Get updated values from the form
@@ -254,18 +421,19 @@ def update_member(connection):
                     sg.popup_error("Age must be 15 or older.")
                     continue
                 
-                # Update the member in the database
-                success = file.update_member(connection, member_id, name, email, phone, address, age, start_date, end_date)
+                # Update the member in the database (fails if no member has that ID)
+                success = wait_for(window, file.submit_write(
+                    file.update_member, connection, member_id, name, email, phone, address, age, start_date, end_date))
                 if success:
                     sg.popup("Member updated successfully!")
                 else:
-                    sg.popup_error("Failed to update member.")
+                    sg.popup_error("No member found with that ID.")
             except Exception as e:
                 sg.popup_error(f"Error: {e}")
             break
 
-    # Close the window
-    window.close()
+    # Hide the window until the form is opened again
+    window.hide()
 
 def delete_member(connection):
     """
@@ -278,46 +446,43 @@ def delete_member(connection):
     - connection (sqlite3.Connection): The active connection to the database.
     """
 
-    # Define the layout for deleting the member
-    layout = [
-        [sg.Text('Enter Member ID to delete:'), sg.InputText(key='-ID-')],
-        [sg.Button('Delete'), sg.Button('Cancel')]
-    ]
-
-    # Create the window
-    window = sg.Window('Delete Member', layout)
+    # Reuse the form's window if it was opened before, otherwise build it
+    window = reuse_form('Delete Member')
+    if window is None:
+        # Define the layout for deleting the member
+        layout = [
+            [sg.Text('Enter Member ID to delete:'), sg.InputText(key='-ID-')],
+            [sg.Button('Delete'), sg.Button('Cancel')]
+        ]
+        window = create_form('Delete Member', layout)
 
     while True:
         # Read the user input
         event, values = window.read()
         # If the user closes the window or clicks Cancel
-        if event in (sg.WIN_CLOSED, 'Cancel'):
+        if event in (sg.WIN_CLOSED, sg.WINDOW_CLOSE_ATTEMPTED_EVENT, 'Cancel'):
             break
         elif event == 'Delete':
-            try:
-                # Get the member ID
-                member_id = int(values['-ID-'])
+            # Get the member ID
+            member_id = is_integer(values['-ID-'], "member id")
 
-                if not file.member_exists(connection, member_id):
-                    sg.popup_error("No member found with that ID.")
-                    continue
+            # make sure id was valid
+            if member_id is None:
+                continue
 
-                # Confirm deleting the member
-                confirm = sg.popup_yes_no("Are you sure you want to delete this member?")
-                if confirm == 'Yes':
-                    # If yes, attempt to delete the member
-                    success = file.delete_member(connection, member_id)
-                    if success:
-                        sg.popup("Member deleted successfully.")
-                    else:
-                        sg.popup_error("Failed to delete member.")
-            except ValueError:
-                # Handle non-integer input
-                sg.popup_error("Invalid ID.")
+            # Confirm deleting the member
+            confirm = sg.popup_yes_no("Are you sure you want to delete this member?")
+            if confirm == 'Yes':
+                # If yes, attempt to delete the member (fails if no member has that ID)
+                success = file.delete_member(connection, member_id)
+                if success:
+                    sg.popup("Member deleted successfully.")
+                else:
+                    sg.popup_error("No member found with that ID.")
             break
     
-    # Close the window
-    window.close()
+    # Hide the window until the form is opened again
+    window.hide()
 
 def display_all_classes(connection):
     """
@@ -334,14 +499,19 @@ def display_all_classes(connection):
     # Fetches all class information
     results = file.get_all_classes(connection)
 
+    # Message if the query fails
+    if results is None:
+        sg.popup("Database query failed or no classes found.")
+        return
+
+    # Read the streamed rows (sg.Table accepts the row tuples as they are)
+    results = list(results)
+
     # Message if the result is empty
     if not results:
         sg.popup("No classes found.")
         return
     
-    # Convert each row into a list for easier handling
-    results = [list(row) for row in results]
-    
     # Define the table headings
     headings = ['ClassID', 'Class Name', 'Class Type', 'Duration', 'Capacity', 'Instructor', 'Gym']
     
@@ -377,19 +547,20 @@ def add_class(connection):
     - connection (sqlite3.Connection): The active connection to the database.
     """
 
-    # Define the layout with input fields and buttons
-    layout = [
-        [sg.Text('Class Name'), sg.InputText(key='-NAME-')],
-        [sg.Text('Class Type'), sg.Combo(['Yoga', 'Zumba', 'HIIT', 'Weights'], key='-TYPE-')],
-        [sg.Text('Duration (in minutes)'), sg.InputText(key='-DURATION-')],
-        [sg.Text('Class Capacity'), sg.InputText(key='-CAPACITY-')],
-        [sg.Text('Instructor ID'), sg.InputText(key='-INSTRUCTORID-')],
-        [sg.Text('Gym ID'), sg.InputText(key='-GYMID-')],
-        [sg.Button('Submit'), sg.Button('Cancel')]
-    ]
-
-    # Create the window
-    window = sg.Window('Add New Class', layout)
+    # Reuse the form's window if it was opened before, otherwise build it
+    window = reuse_form('Add New Class')
+    if window is None:
+        # Define the layout with input fields and buttons
+        layout = [
+            [sg.Text('Class Name'), sg.InputText(key='-NAME-')],
+            [sg.Text('Class Type'), sg.Combo(['Yoga', 'Zumba', 'HIIT', 'Weights'], key='-TYPE-')],
+            [sg.Text('Duration (in minutes)'), sg.InputText(key='-DURATION-')],
+            [sg.Text('Class Capacity'), sg.InputText(key='-CAPACITY-')],
+            [sg.Text('Instructor ID'), sg.InputText(key='-INSTRUCTORID-')],
+            [sg.Text('Gym ID'), sg.InputText(key='-GYMID-')],
+            [sg.Button('Submit'), sg.Button('Cancel')]
+        ]
+        window = create_form('Add New Class', layout)
     
 
     while True:
@@ -397,7 +568,7 @@ def add_class(connection):
         event, values = window.read()
 
         # If the user closes the window or clicks Cancel
-        if event in (sg.WIN_CLOSED, 'Cancel'):
+        if event in (sg.WIN_CLOSED, sg.WINDOW_CLOSE_ATTEMPTED_EVENT, 'Cancel'):
             break
         elif event == 'Submit':
             # Retrieve the form values from the input fields
@@ -432,13 +603,13 @@ def add_class(connection):
                 sg.popup_error("Class capacity must be a positive integer.")
                 continue
 
-            # Validation - the instructor ID must exist
-            if not file.instructor_exists(connection, instructor_id):
+            # Validation - instructor ID must exist (checked against the cached instructor IDs)
+            if instructor_id not in file.get_instructor_id_set(connection):
                 sg.popup_error(f"Instructor ID {instructor_id} does not exist.")
                 continue
 
-            # Validation - gym ID must exist
-            if not file.gym_exists(connection, gym_id):
+            # Validation - gym ID must exist (checked against the cached gym IDs)
+            if gym_id not in file.get_gym_id_set(connection):
                 sg.popup_error(f"Gym ID {gym_id} does not exist.")
                 continue
 
@@ -450,8 +621,8 @@ def add_class(connection):
             else:
                 sg.popup_error("Failed to add class.")
     
-    # Close the window
-    window.close()
+    # Hide the window until the form is opened again
+    window.hide()
 
 def update_class(connection):
     """
@@ -465,26 +636,27 @@ def update_class(connection):
     - connection (sqlite3.Connection): The active connection to the database.
     """
 
-    # Define the layout for updating class information
-    layout = [
-        [sg.Text('Enter Class ID to update'), sg.InputText(key='-ID-')],
-        [sg.Text('New Class Name'), sg.InputText(key='-NAME-')],
-        [sg.Text('New Class Type'), sg.Combo(['Yoga', 'Zumba', 'HIIT', 'Weights'], key='-TYPE-')],
-        [sg.Text('New Duration (in minutes)'), sg.InputText(key='-DURATION-')],
-        [sg.Text('New Capacity'), sg.InputText(key='-CAPACITY-')],
-        [sg.Text('New Instructor ID'), sg.InputText(key='-INSTRUCTORID-')],
-        [sg.Text('New Gym ID'), sg.InputText(key='-GYMID-')],
-        [sg.Button('Update'), sg.Button('Cancel')]
-    ]
-
-    # Create a window
-    window = sg.Window('Update Class', layout)
+    # Reuse the form's window if it was opened before, otherwise build it
+    window = reuse_form('Update Class')
+    if window is None:
+        # Define the layout for updating class information
+        layout = [
+            [sg.Text('Enter Class ID to update'), sg.InputText(key='-ID-')],
+            [sg.Text('New Class Name'), sg.InputText(key='-NAME-')],
+            [sg.Text('New Class Type'), sg.Combo(['Yoga', 'Zumba', 'HIIT', 'Weights'], key='-TYPE-')],
+            [sg.Text('New Duration (in minutes)'), sg.InputText(key='-DURATION-')],
+            [sg.Text('New Capacity'), sg.InputText(key='-CAPACITY-')],
+            [sg.Text('New Instructor ID'), sg.InputText(key='-INSTRUCTORID-')],
+            [sg.Text('New Gym ID'), sg.InputText(key='-GYMID-')],
+            [sg.Button('Update'), sg.Button('Cancel')]
+        ]
+        window = create_form('Update Class', layout)
 
     while True:
         # Read user input and event
         event, values = window.read()
         # If the user closes the window or clicks Cancel
-        if event in (sg.WIN_CLOSED, 'Cancel'):
+        if event in (sg.WIN_CLOSED, sg.WINDOW_CLOSE_ATTEMPTED_EVENT, 'Cancel'):
             break
         elif event == "Update":
             try:
@@ -495,11 +667,6 @@ def update_class(connection):
                 if class_id is None:
                     continue
 
-                # Check if the class exists in the database
-                if not file.class_exists(connection, class_id):
-                    sg.popup_error("No class found with that ID.")
-                    continue
-
                 # Get updated values from the form
                 name = values['-NAME-']
                 class_type = values['-TYPE-']
@@ -532,28 +699,28 @@ def update_class(connection):
                     sg.popup_error("Class capacity must be a positive integer.")
                     continue
 
-                # Validation - the instructor ID must exist
-                if not file.instructor_exists(connection, instructor_id):
+                # Validation - instructor ID must exist (checked against the cached instructor IDs)
+                if instructor_id not in file.get_instructor_id_set(connection):
                     sg.popup_error(f"Instructor ID {instructor_id} does not exist.")
                     continue
 
-                # Validation - gym ID must exist
-                if not file.gym_exists(connection, gym_id):
+                # Validation - gym ID must exist (checked against the cached gym IDs)
+                if gym_id not in file.get_gym_id_set(connection):
                     sg.popup_error(f"Gym ID {gym_id} does not exist.")
                     continue
 
-                # Attempt to update the class in the database
+                # Attempt to update the class in the database (fails if no class has that ID)
                 success = file.update_class(connection, class_id, name, class_type, duration, capacity, instructor_id, gym_id)
                 if success:
                     sg.popup("Class updated successfully!")
                 else:
-                    sg.popup_error("Failed to update class.")
+                    sg.popup_error("No class found with that ID.")
             except Exception as e:
                 sg.popup_error(f"Error: {e}")
             break
 
-    # Close the window
-    window.close()
+    # Hide the window until the form is opened again
+    window.hide()
 
 def delete_class(connection):
     """
@@ -567,20 +734,21 @@ def delete_class(connection):
     - connection (sqlite3.Connection): The active connection to the database.
     """
 
-    # Define the layout for deleting a class
-    layout = [
-        [sg.Text('Enter Class ID to delete'), sg.InputText(key='-ID-')],
-        [sg.Button('Delete'), sg.Button('Cancel')]
-    ]
-
-    # Create the window
-    window = sg.Window('Delete Class', layout)
+    # Reuse the form's window if it was opened before, otherwise build it
+    window = reuse_form('Delete Class')
+    if window is None:
+        # Define the layout for deleting a class
+        layout = [
+            [sg.Text('Enter Class ID to delete'), sg.InputText(key='-ID-')],
+            [sg.Button('Delete'), sg.Button('Cancel')]
+        ]
+        window = create_form('Delete Class', layout)
 
     while True:
         # Read user input and event
         event, values = window.read()
         # If the user closes the window or clicks Cancel
-        if event in (sg.WIN_CLOSED, 'Cancel'):
+        if event in (sg.WIN_CLOSED, sg.WINDOW_CLOSE_ATTEMPTED_EVENT, 'Cancel'):
             break
         elif event == "Delete":
             try:
@@ -591,36 +759,33 @@ def delete_class(connection):
                 if class_id is None:
                     continue
 
-                # Check if the class exists in the database
-                if not file.class_exists(connection, class_id):
-                    sg.popup_error("No class found with that ID.")
-                    continue
-
                 # Check if the class has members
                 if file.class_has_members(connection, class_id):
                     # Ask user to select another class to move members to
                     new_class_id = sg.popup_get_text("Enter a new class ID to move members to:")
-                    # Move the members to the new class and delete the class
-                    if new_class_id and file.move_members(connection, class_id, int(new_class_id)):
-                        sg.popup("Members moved successfully. Deleting class now...")
-                        if file.delete_class(connection, class_id):
-                            sg.popup("Class deleted succesfully!")
-                        else:
-                            sg.popup_error("Failed to delete the class.")
-                    else:
+                    new_class_id = int(new_class_id) if new_class_id else None
+                    if new_class_id is None or new_class_id == class_id:
                         sg.popup_error("No valid class selected to move members to.")
+                    # Check the target class first, so a wrong ID is not reported as a FOREIGN KEY error
+                    elif not file.class_exists(connection, new_class_id):
+                        sg.popup_error(f"Target class ID {new_class_id} not found.")
+                    # Move the members to the new class and delete the class in one transaction
+                    elif file.delete_class(connection, class_id, new_class_id):
+                        sg.popup("Members moved and class deleted successfully!")
+                    else:
+                        sg.popup_error("Failed to move the members and delete the class.")
                 else:
-                    # If there are no members in the class, delete directly
+                    # If there are no members in the class, delete directly (fails if no class has that ID)
                     if file.delete_class(connection, class_id):
                         sg.popup("Class deleted successfully!")
                     else:
-                        sg.popup_error("Failed to delete the class.")
+                        sg.popup_error("No class found with that ID.")
             except Exception as e:
                 sg.popup_error(f"Error: {e}")
             break
 
-    # Close the window
-    window.close()
+    # Hide the window until the form is opened again
+    window.hide()
 
 def find_members_by_class(connection):
     """
@@ -633,20 +798,21 @@ def find_members_by_class(connection):
     - connection (sqlite3.Connection): The active connection to the database.
     """
 
-    # Define the layout
-    layout = [
-        [sg.Text('Enter Class ID:'), sg.InputText(key='-CLASSID-')],
-        [sg.Button('Search'), sg.Button('Cancel')]
-    ]
-
-    # Create the window
-    window = sg.Window('Find Members by Class', layout)
+    # Reuse the form's window if it was opened before, otherwise build it
+    window = reuse_form('Find Members by Class')
+    if window is None:
+        # Define the layout
+        layout = [
+            [sg.Text('Enter Class ID:'), sg.InputText(key='-CLASSID-')],
+            [sg.Button('Search'), sg.Button('Cancel')]
+        ]
+        window = create_form('Find Members by Class', layout)
 
     while True:
         # Read user input and event
         event, values = window.read()
         # If the user closes the window or clicks Cancel
-        if event in (sg.WIN_CLOSED, 'Cancel'):
+        if event in (sg.WIN_CLOSED, sg.WINDOW_CLOSE_ATTEMPTED_EVENT, 'Cancel'):
             break
         elif event == 'Search':
             try:
@@ -657,7 +823,8 @@ def find_members_by_class(connection):
                 if class_id is None:
                     continue
                 
-                results = file.get_members_in_class(connection, class_id)
+                # Look up the members on the database thread while the window stays responsive
+                results = wait_for(window, file.submit_read(file.get_members_in_class, connection, class_id))
 
                 # Message is displayed if there are no members in the given class
                 if not results:
@@ -666,11 +833,9 @@ def find_members_by_class(connection):
                 else:
                     # Define the table headings
                     headings = ['Member ID', 'Name', 'Email', 'Age']
-                    # Convert each row into a list for easier handling
-                    data = [list(row) for row in results]
                     # Create the window with the table
                     sg.Window('Members in Class', [[
-                        sg.Table(values=data, headings=headings,
+                        sg.Table(values=results, headings=headings,
                                  auto_size_columns=True,
                                  justification='center',
                                  num_rows=10)
@@ -679,8 +844,8 @@ def find_members_by_class(connection):
             except ValueError:
                 sg.popup_error("Invalid Class ID.")
 
-    # Close the window
-    window.close()
+    # Hide the window until the form is opened again
+    window.hide()
 
 def list_classes_and_attendance(connection):
     """
@@ -693,17 +858,14 @@ def list_classes_and_attendance(connection):
     - connection (sqlite3.Connection): The active connection to the database.
     """
 
-    # Fetches all class data from file.py ***
-    results = file.get_classes_with_attendance(connection)
+    # Fetches all class data from file.py *** (on the database thread, showing a loading animation)
+    results = wait_for(None, file.submit_read(file.get_classes_with_attendance, connection))
 
     # Message displayed if results are empty
     if not results:
         sg.popup("No classes or attendance data found.")
         return
     
-    # Convert each row into a list for easier handling
-    results = [list(row) for row in results]
-    
     # Define the headings
     headings = ['Class ID', 'Name', 'Type', 'Duration', 'Capacity', '# of Attendees']
 
@@ -727,25 +889,30 @@ def display_all_equipment(connection):
     """
     Displays all equipment in a table format using PySimpleGUI.
 
-    This function retreives all equipment records from the database and displays
-    them in a scrollable table window. If no equipment is found, a popup
-    is displayed with a corresponding message.
+    This function retreives the equipment records from the database one page at a time and
+    displays them in a scrollable table window; 'Load More' adds the next page. If no equipment
+    is found, a popup is displayed with a corresponding message.
 
     Parameters:
     - connection (sqlite3.Connection): The active connection to the database.
     """
 
-    # Fetches all equipment information
-    results = file.get_all_equipment(connection)
+    # Fetches all equipment information (as a stream that is read page by page on the database thread)
+    rows = wait_for(None, file.submit_read(file.get_all_equipment, connection))
+
+    # Message if the query fails
+    if rows is None:
+        sg.popup("Database query failed or no equipment found.")
+        return
+
+    # Read only the first page of rows
+    results = wait_for(None, file.submit_read(read_page, rows))
 
     # Message if the result is empty
     if not results:
         sg.popup("No equipment found.")
         return
     
-    # Convert each row into a list for easier handling
-    results = [list(row) for row in results]
-    
     # Define the table headings
     headings = ['EquipmentID', 'Equipment Name', 'Equipment Type', 'Quantity', 'Gym']
     
@@ -756,12 +923,30 @@ def display_all_equipment(connection):
                        justification='center',
                        num_rows=10,
                        key='-TABLE-',
-                       row_height=35)]
+                       row_height=35)],
+        [sg.Button('Load More', key='-MORE-', disabled=len(results) < PAGE_SIZE), sg.Button('Close')]
     ]
 
-     # Create the window and wait for any event
+     # Create the window
     window = sg.Window("Equipment Information", layout)
-    event, _ = window.read()
+
+    while True:
+        event, _ = window.read()
+
+        # If the user closes the window or clicks Close
+        if event in (sg.WIN_CLOSED, 'Close'):
+            break
+        # Read the next page and add it to the table
+        elif event == '-MORE-':
+            page = wait_for(window, file.submit_read(read_page, rows))
+            # Stop if the window was closed while the page was being read
+            if window.was_closed():
+                break
+            results.extend(page)
+            window['-TABLE-'].update(values=results)
+            # Disable the button once the last page has been read
+            if len(page) < PAGE_SIZE:
+                window['-MORE-'].update(disabled=True)
 
     # Close the window
     window.close()
@@ -773,32 +958,40 @@ def add_equipment(connection):
 
     This function prompts the user to enter all required equipment details. It validates
     constraints such as positive integers, required fields, and foreign key references.
-    It calls the the `add_equipment` method from file.py and displays either a success or failure
-    message accordingly.
+    'Add Another' queues the entered equipment and clears the form for the next one; 'Submit'
+    queues it and inserts everything queued in one transaction through `flush_pending_equipment`,
+    which displays either a success or failure message accordingly. The form closes once the
+    insert succeeds; 'Cancel' discards the queued equipment.
 
     Parameters:
     - connection (sqlite3.Connection): The active connection to the database.
     """
 
-    # Define the layout with input fields and buttons
-    layout = [
-        [sg.Text('Equipment Name'), sg.InputText(key='-NAME-')],
-        [sg.Text('Equipment Type'), sg.Combo(['Cardio', 'Strength', 'Flexibility', 'Recovery'], key='-TYPE-')],
-        [sg.Text('quantity'), sg.InputText(key='-QUANTITY-')],
-        [sg.Text('Gym ID'), sg.InputText(key='-GYMID-')],
-        [sg.Button('Submit'), sg.Button('Cancel')]
-    ]
-
-    window = sg.Window('Add New Equipment', layout)
+    # Start with an empty queue (rows left by a form that ended with an error are discarded)
+    _PENDING_EQUIPMENT.clear()
+
+    # Reuse the form's window if it was opened before, otherwise build it
+    window = reuse_form('Add New Equipment')
+    if window is None:
+        # Define the layout with input fields and buttons
+        layout = [
+            [sg.Text('Equipment Name'), sg.InputText(key='-NAME-')],
+            [sg.Text('Equipment Type'), sg.Combo(['Cardio', 'Strength', 'Flexibility', 'Recovery'], key='-TYPE-')],
+            [sg.Text('quantity'), sg.InputText(key='-QUANTITY-')],
+            [sg.Text('Gym ID'), sg.InputText(key='-GYMID-')],
+            [sg.Button('Submit'), sg.Button('Add Another'), sg.Button('Cancel')]
+        ]
+        window = create_form('Add New Equipment', layout)
 
     while True:
         # Read user input and event
         event, values = window.read()
 
-        # If the user closes the window or clicks Cancel
-        if event in (sg.WIN_CLOSED, 'Cancel'):
+        # If the user closes the window or clicks Cancel, discard the queued equipment
+        if event in (sg.WIN_CLOSED, sg.WINDOW_CLOSE_ATTEMPTED_EVENT, 'Cancel'):
+            _PENDING_EQUIPMENT.clear()
             break
-        elif event == 'Submit':
+        elif event in ('Submit', 'Add Another'):
             # Retrieve the form values from the input fields
             name = values['-NAME-']
             equipment_type = values['-TYPE-']
@@ -824,21 +1017,56 @@ def add_equipment(connection):
                 sg.popup_error("Quantity must be a positive integer.")
                 continue
 
-            # Validation - gym ID must exist
-            if not file.gym_exists(connection, gym_id):
+            # Validation - gym ID must exist (checked against the cached gym IDs)
+            if gym_id not in file.get_gym_id_set(connection):
                 sg.popup_error(f"Gym ID {gym_id} does not exist.")
                 continue
 
-            # Attempt to add the equipment
-            success = file.add_equipment(connection, name, equipment_type, quantity, gym_id)
-            if success:
-                sg.popup("Equipment added successfully!")
+            # Queue the equipment, it is inserted together with any other queued rows
+            _PENDING_EQUIPMENT.append((name, equipment_type, quantity, gym_id))
+
+            # Clear the form for the next piece of equipment
+            if event == 'Add Another':
+                for key in ('-NAME-', '-TYPE-', '-QUANTITY-', '-GYMID-'):
+                    window[key].update('')
+                continue
+
+            # Insert everything that was queued in this form
+            if flush_pending_equipment(connection):
                 break
-            else:
-                sg.popup_error("Failed to add class.")
+            # Keep the form open if the insert failed; this row is queued again on the next Submit
+            _PENDING_EQUIPMENT.pop()
     
-    # Close the window
-    window.close()
+    # Hide the window until the form is opened again
+    window.hide()
+
+def flush_pending_equipment(connection):
+    """
+    Inserts all queued equipment rows with a single executemany in one transaction.
+
+    The queue is only emptied once the rows are inserted, so nothing the user entered is lost
+    when the insert fails.
+
+    Parameters:
+    - connection (sqlite3.Connection): The active connection to the database.
+
+    Returns:
+    - bool: True if the queued rows were inserted (or nothing was queued), False otherwise.
+    """
+
+    # Nothing to insert if no equipment was queued
+    if not _PENDING_EQUIPMENT:
+        return True
+
+    rows = list(_PENDING_EQUIPMENT)
+
+    # Attempt to add the equipment (nothing is inserted if any row fails)
+    if file.add_equipment_bulk(connection, rows):
+        _PENDING_EQUIPMENT.clear()
+        sg.popup(f"{len(rows)} piece(s) of equipment added successfully!")
+        return True
+    sg.popup_error("Failed to add equipment.")
+    return False
 
 def update_equipment(connection):
     """
@@ -852,24 +1080,25 @@ def update_equipment(connection):
     - connection (sqlite3.Connection): The active connection to the database.
     """
 
-    # Define the layout for updating equipment information
-    layout = [
-        [sg.Text('Enter Equipment ID to update'), sg.InputText(key='-ID-')],
-        [sg.Text('New Equipment Name'), sg.InputText(key='-NAME-')],
-        [sg.Text('New Equipment Type'), sg.Combo(['Cardio', 'Strength', 'Flexibility', 'Recovery'], key='-TYPE-')],
-        [sg.Text('New quantity'), sg.InputText(key='-QUANTITY-')],
-        [sg.Text('New Gym ID'), sg.InputText(key='-GYMID-')],
-        [sg.Button('Update'), sg.Button('Cancel')]
-    ]
-
-    # Create a window
-    window = sg.Window('Update Equipment', layout)
+    # Reuse the form's window if it was opened before, otherwise build it
+    window = reuse_form('Update Equipment')
+    if window is None:
+        # Define the layout for updating equipment information
+        layout = [
+            [sg.Text('Enter Equipment ID to update'), sg.InputText(key='-ID-')],
+            [sg.Text('New Equipment Name'), sg.InputText(key='-NAME-')],
+            [sg.Text('New Equipment Type'), sg.Combo(['Cardio', 'Strength', 'Flexibility', 'Recovery'], key='-TYPE-')],
+            [sg.Text('New quantity'), sg.InputText(key='-QUANTITY-')],
+            [sg.Text('New Gym ID'), sg.InputText(key='-GYMID-')],
+            [sg.Button('Update'), sg.Button('Cancel')]
+        ]
+        window = create_form('Update Equipment', layout)
 
     while True:
         # Read user input and event
         event, values = window.read()
         # If the user closes the window or clicks Cancel
-        if event in (sg.WIN_CLOSED, 'Cancel'):
+        if event in (sg.WIN_CLOSED, sg.WINDOW_CLOSE_ATTEMPTED_EVENT, 'Cancel'):
             break
         elif event == "Update":
             try:
@@ -879,11 +1108,6 @@ def update_equipment(connection):
                 # make sure id was valid
                 if equipment_id is None:
                     continue
-                
-                # Check if the class exists in the database
-                if not file.equipment_exists(connection, equipment_id):
-                    sg.popup_error("No equipment found with that ID.")
-                    continue
 
                 # Get updated values from the form
                 name = values['-NAME-']
@@ -910,24 +1134,23 @@ def update_equipment(connection):
                     sg.popup_error("Quantity must be a positive integer.")
                     continue
 
-                # Validation - gym ID must exist
-                if not file.gym_exists(connection, gym_id):
+                # Validation - gym ID must exist (checked against the cached gym IDs)
+                if gym_id not in file.get_gym_id_set(connection):
                     sg.popup_error(f"Gym ID {gym_id} does not exist.")
                     continue
 
-                # Attempt to update the equipment in the database
+                # Attempt to update the equipment in the database (fails if no equipment has that ID)
                 success = file.update_equipment(connection, equipment_id, name, equipment_type, quantity, gym_id)
                 if success:
                     sg.popup("Equipment updated successfully!")
                 else:
-                    sg.popup_error("Failed to update equipment.")
+                    sg.popup_error("No equipment found with that ID.")
             except Exception as e:
                 sg.popup_error(f"Error: {e}")
-                raise
             break
 
-    # Close the window
-    window.close()
+    # Hide the window until the form is opened again
+    window.hide()
 
 def delete_equipment(connection):
     """
@@ -941,21 +1164,22 @@ def delete_equipment(connection):
     - connection (sqlite3.Connection): The active connection to the database.
     """
 
-    # Define the layout for deleting a class
-    layout = [
-        [sg.Text('Enter Equipment ID to delete'), sg.InputText(key='-ID-')],
-        [sg.Button('Delete'), sg.Button('Cancel')]
-    ]
-
-    # Create the window
-    window = sg.Window('Delete Equipment', layout)
+    # Reuse the form's window if it was opened before, otherwise build it
+    window = reuse_form('Delete Equipment')
+    if window is None:
+        # Define the layout for deleting a class
+        layout = [
+            [sg.Text('Enter Equipment ID to delete'), sg.InputText(key='-ID-')],
+            [sg.Button('Delete'), sg.Button('Cancel')]
+        ]
+        window = create_form('Delete Equipment', layout)
 
 
     while True:
         # Read the user input
         event, values = window.read()
         # If the user closes the window or clicks Cancel
-        if event in (sg.WIN_CLOSED, 'Cancel'):
+        if event in (sg.WIN_CLOSED, sg.WINDOW_CLOSE_ATTEMPTED_EVENT, 'Cancel'):
             break
         elif event == 'Delete':
             try:
@@ -965,29 +1189,24 @@ def delete_equipment(connection):
                 # make sure id was valid
                 if equipment_id is None:
                     continue
-                
-                # Check if the class exists in the database
-                if not file.equipment_exists(connection, equipment_id):
-                    sg.popup_error("No equipment found with that ID.")
-                    continue
 
                 # Confirm deleting the member
                 confirm = sg.popup_yes_no("Are you sure you want to delete this equipment?")
                 if confirm == 'Yes':
-                    # If yes, attempt to delete the member
+                    # If yes, attempt to delete the equipment (fails if no equipment has that ID)
                     success = file.delete_equipment(connection, equipment_id)
                     if success:
                         sg.popup("Equipment deleted successfully.")
                     else:
-                        sg.popup_error("Failed to delete equipment.")
+                        sg.popup_error("No equipment found with that ID.")
 
             except ValueError:
                 # Handle non-integer input
                 sg.popup_error("Invalid ID.")
             break
     
-    # Close the window
-    window.close()
+    # Hide the window until the form is opened again
+    window.hide()
 
 # Main menu for the system
 def main_menu():
@@ -1012,6 +1231,14 @@ def main_menu():
     window.close() # Close the window
     return event # Return the event
 
+# Actions of the Members Menu, by button
+_MEMBER_ACTIONS = {
+    "Display All Members": show_members_and_membership_plan, # Option 1 - View all members in the database
+    "Add New Member": add_new_member, # Option 2 - Add a new member to the database
+    "Update Member": update_member, # Option 3 - Update a member's information in the database
+    "Delete Member": delete_member, # Option 4 - Delete a member from the database
+}
+
 def members_menu(connection):
     """
     Displays the Members Menu and handles member-related actions.
@@ -1046,22 +1273,23 @@ def members_menu(connection):
         elif event == "Return to Main Menu":
             window.close()
             return
-        # Option 1 - View all members in the database
-        elif event == "Display All Members":
-            show_members_and_membership_plan(connection)
-        # Option 2 - Add a new member to the database
-        elif event == "Add New Member":
-            add_new_member(connection)
-        # Option 3 - Update a member's information in the database
-        elif event == "Update Member":
-            update_member(connection)
-        # Option 4 - Delete a member from the database
-        elif event == "Delete Member":
-            delete_member(connection)
+        # Run the action of the clicked button (see _MEMBER_ACTIONS)
+        elif event in _MEMBER_ACTIONS:
+            run_action(_MEMBER_ACTIONS[event], connection)
 
     # Close the window
     window.close()
 
+# Actions of the Classes Menu, by button
+_CLASS_ACTIONS = {
+    "Display All Classes": display_all_classes, # Option 1 - View all classes in the database
+    "Add New Class": add_class, # Option 2 - Add new class to the database
+    "Update Class": update_class, # Option 3 - Update class information in the database
+    "Delete Class": delete_class, # Option 4 - Delete a class from the database
+    "List Classes with Attendance": list_classes_and_attendance, # Option 5 - List classes with member attendance
+    "Find Members by Class": find_members_by_class, # Option 6 - Display members by class
+}
+
 def classes_menu(connection):
     """
     Displays the Classes Menu and handles class-related actions.
@@ -1098,28 +1326,21 @@ def classes_menu(connection):
         elif event == "Return to Main Menu":
             window.close()
             return
-        # Option 1 - View all classes in the database
-        elif event == "Display All Classes":
-            display_all_classes(connection)
-        # Option 2- Add new class to the database
-        elif event == "Add New Class":
-            add_class(connection)
-        # Option 3 - Update class information in the databse
-        elif event == "Update Class":
-            update_class(connection)
-        # Option 4 - Delete a class from the database
-        elif event == "Delete Class":
-            delete_class(connection)
-        # Option 5 - List classes with member attendance
-        elif event == "List Classes with Attendance":
-            list_classes_and_attendance(connection)
-        # Option 6 - Display members by class
-        elif event == "Find Members by Class":
-            find_members_by_class(connection)
+        # Run the action of the clicked button (see _CLASS_ACTIONS)
+        elif event in _CLASS_ACTIONS:
+            run_action(_CLASS_ACTIONS[event], connection)
 
     # Close window
     window.close()
 
+# Actions of the Equipment Menu, by button
+_EQUIPMENT_ACTIONS = {
+    "Display All Equipment": display_all_equipment, # Option 1 - View all equipment in the database
+    "Add New Equipment": add_equipment, # Option 2 - Add new equipment to the database
+    "Update Equipment": update_equipment, # Option 3 - Update equipment information in the database
+    "Delete Equipment": delete_equipment, # Option 4 - Delete equipment from the database
+}
+
 def equipment_menu(connection):
     # Define the layout for the Classes Menu
     layout = [
@@ -1145,18 +1366,9 @@ def equipment_menu(connection):
         elif event == "Return to Main Menu":
             window.close()
             return
-        # Option 1 - View all classes in the database
-        elif event == "Display All Equipment":
-            display_all_equipment(connection)
-        # Option 2- Add new class to the database
-        elif event == "Add New Equipment":
-            add_equipment(connection)
-        # Option 3 - Update class information in the databse
-        elif event == "Update Equipment":
-            update_equipment(connection)
-        # Option 4 - Delete a class from the database
-        elif event == "Delete Equipment":
-            delete_equipment(connection)
+        # Run the action of the clicked button (see _EQUIPMENT_ACTIONS)
+        elif event in _EQUIPMENT_ACTIONS:
+            run_action(_EQUIPMENT_ACTIONS[event], connection)
 
 def run_program():
     """
@@ -1164,7 +1376,9 @@ def run_program():
     Establishes a database conncetion and displays the main menu.
     """
 
-    # Establish connection to the database
+    # Establish connection to the database; it is opened already configured (WAL journal,
+    # synchronous=NORMAL, in-memory temp store, 64 MB cache, mmap) by file.configure_connection,
+    # and every menu action below reuses it
     connection = file.connectToDatabase()
     if connection:
         while True:
@@ -1189,7 +1403,19 @@ def run_program():
                 break
             
 def is_integer(input, input_field_name):
-    if not input.strip():
+    """
+    Parses an integer form field, showing an error popup if it is empty or not an integer.
+
+    Parameters:
+    - input (str): The raw field value.
+    - input_field_name (str): Name of the field, used in the error message.
+
+    Returns:
+    - int: The parsed value, or None if the input is invalid (callers use it without re-casting).
+    """
+
+    # Empty or whitespace-only input (checked without building a stripped copy)
+    if not input or input.isspace():
         sg.popup_error(f"ERROR: The {input_field_name} field cannot be empty.")
         return None
     try:
@@ -1199,7 +1425,19 @@ def is_integer(input, input_field_name):
         return None
     
 def is_float(input, input_field_name):
-    if not input.strip():
+    """
+    Parses a decimal form field, showing an error popup if it is empty or not a number.
+
+    Parameters:
+    - input (str): The raw field value.
+    - input_field_name (str): Name of the field, used in the error message.
+
+    Returns:
+    - float: The parsed value, or None if the input is invalid (callers use it without re-casting).
+    """
+
+    # Empty or whitespace-only input (checked without building a stripped copy)
+    if not input or input.isspace():
         sg.popup_error(f"ERROR: The {input_field_name} field cannot be empty.")
         return None
     try: